@@ -13,4 +13,23 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Dishom.settings')
 
-application = get_asgi_application()
+# Set up Django before importing anything that touches models.
+django_asgi_app = get_asgi_application()
+
+try:
+    from channels.auth import AuthMiddlewareStack
+    from channels.routing import ProtocolTypeRouter, URLRouter
+    from channels.security.websocket import AllowedHostsOriginValidator
+except ImportError:
+    # Channels is optional; without it only HTTP is served.
+    application = django_asgi_app
+else:
+    from dashboard.channels_auth import JWTQueryAuthMiddleware
+    from dashboard.routing import websocket_urlpatterns
+
+    application = ProtocolTypeRouter({
+        'http': django_asgi_app,
+        'websocket': AllowedHostsOriginValidator(
+            AuthMiddlewareStack(JWTQueryAuthMiddleware(URLRouter(websocket_urlpatterns)))
+        ),
+    })
@@ -10,6 +10,7 @@ from datetime import timedelta
 from typing import Any, Dict, List
 
 import importlib
+import importlib.util
 try:
     load_dotenv = importlib.import_module('dotenv').load_dotenv  # type: ignore[attr-defined]
     load_dotenv()
@@ -79,6 +80,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'rest_framework',
     'rest_framework_simplejwt',
@@ -103,7 +105,7 @@ AUTH_GROUP_MODEL = 'accounts.CustomGroup'
 # ============================================================
 REST_FRAMEWORK: Dict[str, Any] = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -125,7 +127,8 @@ SIMPLE_JWT: Dict[str, Any] = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
-    'UPDATE_LAST_LOGIN': True,
+    # Login goes through the user_logged_in signal, which already updates last_login.
+    'UPDATE_LAST_LOGIN': False,
     
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
@@ -161,6 +164,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'dashboard.middleware.AuditContextMiddleware',
 ]
 
 if DEBUG:
@@ -235,6 +239,24 @@ else:
     }
 CACHES: Dict[str, Dict[str, Any]] = _caches_cfg
 
+# Channels (optional): websocket live feed
+ASGI_APPLICATION = 'Dishom.asgi.application'
+CHANNEL_LAYERS: Dict[str, Dict[str, Any]]
+# Without channels_redis installed, fall back to the in-memory layer rather than failing every group send.
+if os.getenv('REDIS_URL') and importlib.util.find_spec('channels_redis') is not None:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [os.getenv('REDIS_URL')]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        }
+    }
+
 # Session Configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 SESSION_COOKIE_AGE = 1209600  # 2 weeks
@@ -0,0 +1,195 @@
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import AccessRevocation
+
+
+USER_CACHE_TTL = getattr(settings, 'ACCOUNTS_USER_CACHE_TTL', 300)
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_is_shared():
+    """Whether writes to the default cache are seen by every worker process."""
+    return settings.CACHES.get('default', {}).get('BACKEND') not in PROCESS_LOCAL_CACHES
+
+
+def _user_key(user_id):
+    return f'accounts:user:{user_id}'
+
+
+def _revoked_jti_key(jti):
+    return f'accounts:revoked:jti:{jti}'
+
+
+def _revoked_user_key(user_id):
+    return f'accounts:revoked:user:{user_id}'
+
+
+def revoke_token(jti, exp):
+    """Deny an access token until it expires on its own."""
+    cache.set(_revoked_jti_key(jti), 1, max(int(exp - time.time()), 1))
+
+
+def revoke_users(user_ids):
+    """Deny every access token issued to ``user_ids`` up to now."""
+    lifetime = api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+    revoked_at = time.time()
+    cache.set_many({_revoked_user_key(user_id): revoked_at for user_id in user_ids}, int(lifetime) + 1)
+    if not cache_is_shared():
+        # Other workers cannot see this cache, so they read revocations from the database.
+        at = datetime.fromtimestamp(revoked_at, tz=timezone.utc)
+        existing = get_user_model().objects.filter(pk__in=list(user_ids)).values_list('pk', flat=True)
+        AccessRevocation.objects.bulk_create(
+            [AccessRevocation(user_id=user_id, revoked_at=at) for user_id in existing],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['revoked_at'],
+        )
+
+
+def revoke_user(user_id):
+    revoke_users([user_id])
+
+
+def is_revoked(token):
+    keys = [_revoked_jti_key(token.get(api_settings.JTI_CLAIM)), _revoked_user_key(token.get(api_settings.USER_ID_CLAIM))]
+    denied = cache.get_many(keys)
+    if keys[0] in denied:
+        return True
+    revoked_at = denied.get(keys[1])
+    return revoked_at is not None and token.get('iat', 0) <= revoked_at
+
+
+def load_user(user_id):
+    """Full user row for ``user_id``, cached briefly; invalidated when the user is saved or deleted."""
+    key = _user_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user_model = get_user_model()
+        user = user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        cache.set(key, user, USER_CACHE_TTL)
+    return user
+
+
+def forget_user(user_id):
+    cache.delete(_user_key(user_id))
+
+
+class ClaimsUser(TokenUser):
+    """User whose identity and role come from access token claims.
+
+    Everything else (profile fields, groups, permissions) is read from the
+    cached user row, so edits show up without a new token.
+    """
+
+    @cached_property
+    def user(self):
+        return load_user(self.id)
+
+    @cached_property
+    def username(self):
+        return self.user.username
+
+    def get_username(self):
+        return self.user.get_username()
+
+    def __str__(self):
+        return str(self.user)
+
+    @cached_property
+    def role(self):
+        return self.token['role'] if 'role' in self.token else self.user.role
+
+    @cached_property
+    def is_staff(self):
+        return self.token['is_staff'] if 'is_staff' in self.token else self.user.is_staff
+
+    @cached_property
+    def is_superuser(self):
+        return self.token['is_superuser'] if 'is_superuser' in self.token else self.user.is_superuser
+
+    @property
+    def groups(self):
+        return self.user.groups
+
+    @property
+    def user_permissions(self):
+        return self.user.user_permissions
+
+    def get_group_permissions(self, obj=None):
+        return self.user.get_group_permissions(obj)
+
+    def get_all_permissions(self, obj=None):
+        return self.user.get_all_permissions(obj)
+
+    def has_perm(self, perm, obj=None):
+        return self.user.has_perm(perm, obj)
+
+    def has_perms(self, perm_list, obj=None):
+        return self.user.has_perms(perm_list, obj)
+
+    def has_module_perms(self, module):
+        return self.user.has_module_perms(module)
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.user, attr)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT authentication without a user SELECT on read-only requests.
+
+    Safe methods get a ``ClaimsUser``; writes get the user freshly loaded from
+    the database, since it may be saved or assigned to foreign keys. Both
+    consult the revocation deny-list, since a token user cannot see
+    ``is_active``. When the cache is per-process, deactivations and revocations
+    made in other workers are invisible to it, so every request loads the user
+    together with its ``AccessRevocation`` row in one query, as plain
+    ``JWTAuthentication`` would.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        if is_revoked(validated_token):
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+        if not cache_is_shared():
+            return self._load_user(validated_token)
+        return ClaimsUser(validated_token)
+
+    def _load_user(self, validated_token):
+        user = (
+            self.user_model.objects.select_related('access_revocation')
+            .filter(**{api_settings.USER_ID_FIELD: validated_token[api_settings.USER_ID_CLAIM]})
+            .first()
+        )
+        if user is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        revocation = getattr(user, 'access_revocation', None)
+        if revocation is not None and validated_token.get('iat', 0) <= revocation.revoked_at.timestamp():
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+        return user
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is None or not isinstance(result[0], ClaimsUser) or request.method in SAFE_METHODS:
+            return result
+        return super().get_user(result[1]), result[1]
@@ -0,0 +1,131 @@
+import hashlib
+import threading
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import now
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from .authentication import cache_is_shared
+
+
+GENERATION_KEY = 'accounts:blacklist:generation'
+ENTRY_TTL = 3600
+
+
+def _entry_key(generation):
+    return f'accounts:blacklist:entry:{generation}'
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings: no false negatives, tunable false positives."""
+
+    def __init__(self, bits: int = 1 << 23, hashes: int = 7):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray(bits // 8)
+        self.count = 0
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        for pos in self._positions(value):
+            self.array[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class BlacklistFilter:
+    """Per-process filter of blacklisted refresh token jtis.
+
+    Every blacklisting bumps a cache generation counter and stores its jti
+    under that generation. Before answering, a process reads the counter and
+    replays the entries it has not seen; only a gap (evicted entries, a fresh
+    process, or an overfull filter) falls back to a rebuild from the database.
+    Without a cache shared between processes another worker's blacklisting is
+    never seen, so every jti is reported as a possible hit.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter: Optional[BloomFilter] = None
+        self.generation = 0
+        self.bits = getattr(settings, 'ACCOUNTS_BLACKLIST_FILTER_BITS', 1 << 23)
+        self.hashes = getattr(settings, 'ACCOUNTS_BLACKLIST_FILTER_HASHES', 7)
+        self.capacity = getattr(settings, 'ACCOUNTS_BLACKLIST_FILTER_CAPACITY', 500000)
+        self.max_replay = 1000
+
+    def _rebuild(self, generation: int) -> None:
+        jtis = BlacklistedToken.objects.filter(token__expires_at__gt=now()).values_list('token__jti', flat=True)
+        # Leave room for replays, so an overfull filter grows instead of being rebuilt on every generation.
+        total = jtis.count()
+        while total > self.capacity // 2:
+            self.bits *= 2
+            self.capacity *= 2
+        bloom = BloomFilter(self.bits, self.hashes)
+        for jti in jtis.iterator(chunk_size=5000):
+            bloom.add(jti)
+        self.filter = bloom
+        self.generation = generation
+
+    def sync(self) -> None:
+        generation = cache.get(GENERATION_KEY, 0)
+        with self.lock:
+            if self.filter is not None and generation == self.generation:
+                return
+            behind = generation - self.generation
+            if self.filter is None or behind < 0 or behind > self.max_replay or self.filter.count > self.capacity:
+                self._rebuild(generation)
+                return
+            keys = [_entry_key(g) for g in range(self.generation + 1, generation + 1)]
+            entries = cache.get_many(keys)
+            if len(entries) < len(keys):
+                self._rebuild(generation)
+                return
+            for jti in entries.values():
+                self.filter.add(jti)
+            self.generation = generation
+
+    def might_contain(self, jti: str) -> bool:
+        if not cache_is_shared():
+            return True
+        self.sync()
+        return jti in self.filter
+
+
+blacklist_filter = BlacklistFilter()
+
+
+def publish_blacklisted(jtis: Iterable[str]) -> None:
+    """Announce newly blacklisted jtis to every process's filter."""
+    jtis = list(jtis)
+    if not jtis:
+        return
+    # One incr reserves a generation per jti.
+    try:
+        last = cache.incr(GENERATION_KEY, len(jtis))
+    except ValueError:
+        cache.add(GENERATION_KEY, 0, timeout=None)
+        last = cache.incr(GENERATION_KEY, len(jtis))
+    first = last - len(jtis) + 1
+    cache.set_many({_entry_key(first + i): jti for i, jti in enumerate(jtis)}, ENTRY_TTL)
+
+
+def prune_expired_tokens(chunk_size: int = 5000) -> int:
+    """Delete expired outstanding tokens and their blacklist rows, ``chunk_size`` at a time."""
+    cutoff = now()
+    deleted = 0
+    while True:
+        ids = list(OutstandingToken.objects.filter(expires_at__lt=cutoff).values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from accounts.blacklist import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding and blacklisted JWT refresh tokens in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        deleted = prune_expired_tokens(options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} expired tokens'))
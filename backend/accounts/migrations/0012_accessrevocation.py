@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-17 20:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_usersession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccessRevocation',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='access_revocation', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('revoked_at', models.DateTimeField(verbose_name='Revoked At')),
+            ],
+            options={
+                'verbose_name': 'Access Revocation',
+                'verbose_name_plural': 'Access Revocations',
+            },
+        ),
+    ]
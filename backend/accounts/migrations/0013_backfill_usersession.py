@@ -0,0 +1,42 @@
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_user_sessions(apps, schema_editor):
+    Session = apps.get_model('sessions', 'Session')
+    UserSession = apps.get_model('accounts', 'UserSession')
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    store = SessionStore()
+    sessions = (
+        Session.objects.filter(expire_date__gt=timezone.now(), user_session__isnull=True)
+        .values_list('session_key', 'session_data', 'expire_date')
+    )
+    owners = {}
+    for key, data, expire_date in sessions.iterator(chunk_size=2000):
+        user_id = store.decode(data).get(SESSION_KEY)
+        if user_id is not None:
+            owners[key] = (user_id, expire_date)
+    user_ids = {user_id for user_id, _ in owners.values()}
+    existing = {str(pk) for pk in CustomUser.objects.filter(pk__in=user_ids).values_list('pk', flat=True)}
+    UserSession.objects.bulk_create(
+        [
+            UserSession(session_id=key, user_id=user_id, expire_date=expire_date)
+            for key, (user_id, expire_date) in owners.items()
+            if str(user_id) in existing
+        ],
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_accessrevocation'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_user_sessions, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager, Group as BaseGroup
+from django.contrib.sessions.models import Session
 from django.db import models
 from django.core.validators import RegexValidator
 
@@ -132,3 +133,24 @@ class CustomGroup(BaseGroup):
         
     def __str__(self):
         return self.name
+
+
+class UserSession(models.Model):
+    """Which user owns which database session, so a user's sessions can be found without decoding them all"""
+    session = models.OneToOneField(Session, on_delete=models.CASCADE, primary_key=True, related_name='user_session')
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='sessions')
+    expire_date = models.DateTimeField('Expire Date', db_index=True)
+
+    class Meta:
+        verbose_name = 'User Session'
+        verbose_name_plural = 'User Sessions'
+
+
+class AccessRevocation(models.Model):
+    """Access tokens issued to ``user`` up to ``revoked_at`` are denied; read when the cache is per-process"""
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True, related_name='access_revocation')
+    revoked_at = models.DateTimeField('Revoked At')
+
+    class Meta:
+        verbose_name = 'Access Revocation'
+        verbose_name_plural = 'Access Revocations'
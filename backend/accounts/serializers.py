@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.contrib.auth.signals import user_logged_in
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.exceptions import AuthenticationFailed
+from .blacklist import blacklist_filter
 
 User = get_user_model()
 
@@ -58,11 +61,14 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token = super().get_token(user)
         token['role'] = user.role
         token['full_name'] = user.get_full_name()
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
         return token
 
     def validate(self, attrs):
         try:
             data = super().validate(attrs)
+            user_logged_in.send(sender=self.user.__class__, request=self.context.get('request'), user=self.user)
             return data
         except AuthenticationFailed as exc:
             msg = str(exc)
@@ -72,4 +78,15 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 })
             raise AuthenticationFailed({'error': 'मोबाइल नंबर या पासवर्ड गलत है / Invalid mobile number or password'})
         except KeyError:
-            raise serializers.ValidationError({'error': 'कृपया सभी आवश्यक फ़ील्ड भरें / Please fill all required fields'})
\ No newline at end of file
+            raise serializers.ValidationError({'error': 'कृपया सभी आवश्यक फ़ील्ड भरें / Please fill all required fields'})
+
+
+class FilteredRefreshToken(RefreshToken):
+    def check_blacklist(self):
+        # The filter has no false negatives, so only possible hits reach the database.
+        if blacklist_filter.might_contain(self.payload['jti']):
+            super().check_blacklist()
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = FilteredRefreshToken
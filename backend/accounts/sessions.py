@@ -0,0 +1,51 @@
+from typing import Dict, Iterable
+
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.utils.timezone import now
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from .authentication import revoke_users
+from .blacklist import publish_blacklisted
+from .models import UserSession
+
+
+def track_session(sender, request, user, **kwargs):
+    session = getattr(request, 'session', None)
+    # Token logins never save a session, so there is nothing to map.
+    if session is None or not session.session_key:
+        return
+    UserSession.objects.update_or_create(
+        session_id=session.session_key,
+        defaults={'user': user, 'expire_date': session.get_expiry_date()},
+    )
+
+
+def forget_session(sender, request, user, **kwargs):
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        UserSession.objects.filter(session_id=session.session_key).delete()
+
+
+def force_logout(user_ids: Iterable[int]) -> Dict[str, int]:
+    """End every session and token of ``user_ids``.
+
+    Sessions are found through ``UserSession`` and deleted in one statement
+    (cascading to their mapping rows). Unexpired refresh tokens are
+    blacklisted in bulk, and access tokens are denied through the revocation list.
+    """
+    user_ids = list(user_ids)
+    session_keys = UserSession.objects.filter(user_id__in=user_ids).values('session_id')
+    _, deleted = Session.objects.filter(session_key__in=session_keys).delete()
+
+    tokens = list(
+        OutstandingToken.objects.filter(user_id__in=user_ids, expires_at__gt=now(), blacklistedtoken__isnull=True)
+        .values_list('id', 'jti')
+    )
+    BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token_id=token_id) for token_id, _ in tokens], ignore_conflicts=True
+    )
+    jtis = [jti for _, jti in tokens]
+    transaction.on_commit(lambda: publish_blacklisted(jtis))
+    revoke_users(user_ids)
+    return {'sessions_deleted': deleted.get(Session._meta.label, 0), 'tokens_blacklisted': len(tokens)}
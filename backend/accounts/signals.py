@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .authentication import forget_user, revoke_user
+from .blacklist import publish_blacklisted
+from .sessions import forget_session, track_session
+
+
+# Fields whose change makes outstanding access token claims wrong.
+CLAIM_FIELDS = ('is_active', 'is_staff', 'is_superuser', 'role')
+
+
+def _claims(instance):
+    values = instance.__dict__
+    return tuple(values.get(name) for name in CLAIM_FIELDS)
+
+
+def on_user_init(sender, instance, **kwargs):
+    instance._claims_state = _claims(instance)
+
+
+def on_user_saved(sender, instance, created, raw=False, **kwargs):
+    forget_user(instance.pk)
+    current = _claims(instance)
+    if not created and getattr(instance, '_claims_state', current) != current:
+        revoke_user(instance.pk)
+    instance._claims_state = current
+
+
+def on_user_deleted(sender, instance, **kwargs):
+    forget_user(instance.pk)
+    revoke_user(instance.pk)
+
+
+def on_token_blacklisted(sender, instance, created, **kwargs):
+    if created:
+        # Published after commit: a process that sees the new generation first
+        # rebuilds from the database and must find the row there.
+        jti = instance.token.jti
+        transaction.on_commit(lambda: publish_blacklisted([jti]))
+
+
+def connect():
+    user_model = get_user_model()
+    post_init.connect(on_user_init, sender=user_model, dispatch_uid='accounts_claims_init')
+    post_save.connect(on_user_saved, sender=user_model, dispatch_uid='accounts_user_saved')
+    post_delete.connect(on_user_deleted, sender=user_model, dispatch_uid='accounts_user_deleted')
+    post_save.connect(on_token_blacklisted, sender=BlacklistedToken, dispatch_uid='accounts_token_blacklisted')
+    user_logged_in.connect(track_session, dispatch_uid='accounts_track_session')
+    user_logged_out.connect(forget_session, dispatch_uid='accounts_forget_session')
@@ -1,3 +1,143 @@
-from django.test import TestCase
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from .authentication import ClaimsUser, StatelessJWTAuthentication, load_user, revoke_users
+from .blacklist import GENERATION_KEY, BlacklistFilter, _entry_key, publish_blacklisted
+from .models import CustomUser
+from .serializers import CustomTokenObtainPairSerializer, FilteredRefreshToken
+
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+SHARED_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tempfile.mkdtemp()}}
+
+
+class BlacklistFilterTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user('9000000001', password='pw12345!')
+        self.filter = BlacklistFilter()
+        patcher = mock.patch('accounts.serializers.blacklist_filter', self.filter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _blacklist_elsewhere(self, token):
+        # Another worker's write: the row exists, but this process saw no signal.
+        outstanding = OutstandingToken.objects.get(jti=token['jti'])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=outstanding)])
+
+    def test_publish_reserves_one_generation_per_jti(self):
+        with override_settings(CACHES=SHARED_CACHE):
+            cache.clear()
+            publish_blacklisted(['a', 'b', 'c'])
+            publish_blacklisted(['d'])
+            self.assertEqual(cache.get(GENERATION_KEY), 4)
+            self.assertEqual(cache.get_many([_entry_key(g) for g in range(1, 5)]), {
+                _entry_key(1): 'a', _entry_key(2): 'b', _entry_key(3): 'c', _entry_key(4): 'd',
+            })
+
+    def test_shared_cache_rejects_jti_published_by_another_process(self):
+        with override_settings(CACHES=SHARED_CACHE):
+            cache.clear()
+            token = FilteredRefreshToken.for_user(self.user)
+            FilteredRefreshToken(str(token))
+            self._blacklist_elsewhere(token)
+            publish_blacklisted([token['jti']])
+            with self.assertRaises(TokenError):
+                FilteredRefreshToken(str(token))
+
+    def test_process_local_cache_always_checks_database(self):
+        with override_settings(CACHES=LOCAL_CACHE):
+            token = FilteredRefreshToken.for_user(self.user)
+            FilteredRefreshToken(str(token))
+            self._blacklist_elsewhere(token)
+            with self.assertRaises(TokenError):
+                FilteredRefreshToken(str(token))
+
+
+    def test_overfull_filter_grows_instead_of_rebuilding_each_time(self):
+        with override_settings(CACHES=SHARED_CACHE):
+            cache.clear()
+            self.filter.bits, self.filter.capacity = 64, 4
+            tokens = [FilteredRefreshToken.for_user(self.user) for _ in range(6)]
+            for token in tokens[:5]:
+                self._blacklist_elsewhere(token)
+            self.assertTrue(self.filter.might_contain(tokens[0]['jti']))
+            self.assertGreaterEqual(self.filter.capacity, 10)
+            self._blacklist_elsewhere(tokens[5])
+            publish_blacklisted([tokens[5]['jti']])
+            with mock.patch.object(self.filter, '_rebuild', wraps=self.filter._rebuild) as rebuild:
+                self.assertTrue(self.filter.might_contain(tokens[5]['jti']))
+            rebuild.assert_not_called()
+
+
+    def test_blacklisting_is_published_after_commit(self):
+        with override_settings(CACHES=SHARED_CACHE):
+            cache.clear()
+            token = FilteredRefreshToken.for_user(self.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                token.blacklist()
+                self.assertIsNone(cache.get(GENERATION_KEY))
+            self.assertEqual(cache.get(GENERATION_KEY), 1)
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user('9000000002', password='pw12345!', full_name='Old Name', role='Student')
+        self.token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        self.factory = APIRequestFactory()
+
+    def _authenticate(self, method='get'):
+        request = getattr(self.factory, method)('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return StatelessJWTAuthentication().authenticate(request)[0]
+
+    def test_profile_fields_come_from_the_model(self):
+        with override_settings(CACHES=SHARED_CACHE):
+            cache.clear()
+            self.user.full_name = 'New Name'
+            self.user.save()
+            user = self._authenticate()
+            self.assertIsInstance(user, ClaimsUser)
+            self.assertEqual(user.full_name, 'New Name')
+            self.assertEqual(user.role, 'Student')
+
+    def test_writes_get_a_fresh_user(self):
+        with override_settings(CACHES=SHARED_CACHE):
+            cache.clear()
+            load_user(self.user.pk)
+            CustomUser.objects.filter(pk=self.user.pk).update(full_name='Changed Elsewhere')
+            user = self._authenticate('post')
+            self.assertIsInstance(user, CustomUser)
+            self.assertEqual(user.full_name, 'Changed Elsewhere')
+
+    def test_process_local_cache_sees_deactivation_in_another_worker(self):
+        with override_settings(CACHES=LOCAL_CACHE):
+            self._authenticate()
+            CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+            with self.assertRaises(AuthenticationFailed):
+                self._authenticate()
+
+    def test_process_local_cache_sees_revocation_in_another_worker(self):
+        with override_settings(CACHES=LOCAL_CACHE):
+            revoke_users([self.user.pk])
+            cache.clear()
+            with self.assertRaises(AuthenticationFailed):
+                self._authenticate()
+
+    def test_no_more_queries_than_jwt_authentication(self):
+        with override_settings(CACHES=SHARED_CACHE):
+            cache.clear()
+            with self.assertNumQueries(0):
+                self._authenticate()
+            with self.assertNumQueries(1):
+                self._authenticate('post')
+        with override_settings(CACHES=LOCAL_CACHE):
+            with self.assertNumQueries(1):
+                self.assertIsInstance(self._authenticate(), CustomUser)
+            with self.assertNumQueries(1):
+                self._authenticate('post')
@@ -1,11 +1,10 @@
 from django.urls import path
-from .views import RegisterView, CustomTokenObtainPairView, PasswordResetRequestView, UserProfileView
-from rest_framework_simplejwt.views import TokenRefreshView
+from .views import RegisterView, CustomTokenObtainPairView, CustomTokenRefreshView, PasswordResetRequestView, UserProfileView
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
     path('password/reset/', PasswordResetRequestView.as_view(), name='password_reset_request'),
     path('me/', UserProfileView.as_view(), name='user_profile'),
 ]
\ No newline at end of file
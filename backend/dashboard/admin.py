@@ -1,6 +1,7 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin
 from .models import AuditLog, Incident, AlertRule
+from .search import search_audit_logs
 
 
 @admin.register(AuditLog)
@@ -12,6 +13,11 @@ class AuditLogAdmin(ModelAdmin):
     search_fields = ('user_agent', 'metadata')
     date_hierarchy = 'timestamp'
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_audit_logs(queryset, search_term).order_by('-search_rank', '-timestamp'), False
+
 
 @admin.register(Incident)
 class IncidentAdmin(ModelAdmin):
@@ -0,0 +1,71 @@
+import operator
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from django.utils.timezone import now
+
+from .metrics import available_metrics, window_values
+from .models import AlertRule, Incident
+
+
+OPERATORS = {
+    'gt': operator.gt,
+    'ge': operator.ge,
+    'lt': operator.lt,
+    'le': operator.le,
+    'eq': operator.eq,
+    'ne': operator.ne,
+}
+
+
+def evaluate_alert_rules(at: Optional[datetime] = None) -> Dict[str, int]:
+    """Evaluate every active rule and open or refresh its Incident.
+
+    Rules are grouped by ``(metric_name, window_minutes)`` and each distinct
+    window is computed once for its whole group. A firing rule that already
+    has an open or acknowledged incident updates it instead of opening a new one.
+    """
+    at = at or now()
+    rules = list(AlertRule.objects.filter(metric_name__in=available_metrics(), active=True))
+    groups: Dict[Tuple[str, int], List[AlertRule]] = defaultdict(list)
+    for rule in rules:
+        groups[(rule.metric_name, rule.window_minutes)].append(rule)
+    values = window_values(groups.keys(), at)
+
+    firing = [
+        (rule, values[key])
+        for key, group in groups.items()
+        for rule in group
+        if OPERATORS[rule.operator](values[key], rule.threshold)
+    ]
+    current: Dict[int, Incident] = {}
+    for incident in Incident.objects.filter(rule__in=[r.id for r, _ in firing], status__in=['open', 'acknowledged']):
+        current.setdefault(incident.rule_id, incident)
+
+    opened, updated = [], []
+    for rule, value in firing:
+        evaluation = {
+            'metric_name': rule.metric_name,
+            'window_minutes': rule.window_minutes,
+            'operator': rule.operator,
+            'threshold': rule.threshold,
+            'value': value,
+            'evaluated_at': at.isoformat(),
+        }
+        incident = current.get(rule.id)
+        if incident:
+            incident.metadata = {**incident.metadata, **evaluation}
+            incident.updated_at = at
+            updated.append(incident)
+        else:
+            title = f"{rule.name}: {rule.metric_name} {rule.get_operator_display()} {rule.threshold:g}"
+            opened.append(Incident(
+                title=title[:200],
+                severity=rule.severity,
+                rule=rule,
+                metadata={**evaluation, 'first_value': value},
+            ))
+    Incident.objects.bulk_create(opened)
+    Incident.objects.bulk_update(updated, ['metadata', 'updated_at'])
+    return {'rules': len(rules), 'windows': len(values), 'opened': len(opened), 'updated': len(updated)}
@@ -0,0 +1,162 @@
+import atexit
+import ipaddress
+import logging
+import os
+import threading
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils.timezone import now
+
+from . import livefeed
+
+
+logger = logging.getLogger(__name__)
+
+# The HttpRequest being served, so signal handlers can attach user, IP and user agent.
+current_request: ContextVar = ContextVar('dashboard_audit_request', default=None)
+
+
+def _valid_ip(value: Optional[str]) -> Optional[str]:
+    try:
+        return str(ipaddress.ip_address((value or '').strip()))
+    except ValueError:
+        return None
+
+
+def _client_ip(request) -> Optional[str]:
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    return (forwarded and _valid_ip(forwarded.split(',')[0])) or _valid_ip(request.META.get('REMOTE_ADDR'))
+
+
+class AuditBuffer:
+    """In-process queue of pending AuditLog rows, written by a background thread.
+
+    ``append`` only touches a deque. The writer thread flushes with one
+    ``bulk_create`` once ``flush_size`` entries are pending or every
+    ``flush_interval`` seconds, and a final flush runs at interpreter exit.
+    If the database falls behind, the oldest entries beyond ``max_pending``
+    are dropped rather than growing memory without bound.
+    """
+
+    def __init__(self, flush_size: int = 200, flush_interval: float = 1.0, max_pending: int = 10000):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.pending: deque = deque(maxlen=max_pending)
+        self.dropped = 0
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stopping = False
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(entry)
+        self._ensure_worker()
+        if len(self.pending) >= self.flush_size:
+            self._wakeup.set()
+
+    def _ensure_worker(self) -> None:
+        # Started lazily, and again after a fork, since threads do not survive fork().
+        if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            batch: List[Dict[str, Any]] = []
+            while self.pending:
+                batch.append(self.pending.popleft())
+            if not batch:
+                return 0
+            from .history import record_snapshots
+            from .models import AuditLog
+
+            states = [entry.pop('state', None) for entry in batch]
+            close_old_connections()
+            try:
+                logs = AuditLog.objects.bulk_create([AuditLog(**entry) for entry in batch], batch_size=500)
+            except Exception:
+                logger.exception('Could not write %d audit log entries, retrying one by one', len(batch))
+                logs, states = self._write_each(batch, states)
+                if not logs:
+                    return 0
+            try:
+                record_snapshots(logs, states)
+            except Exception:
+                logger.exception('Could not snapshot %d audit log entries', len(logs))
+            try:
+                by_stream = livefeed.publish(logs)
+                # No new event loops can start once the interpreter is shutting down.
+                if not self._stopping:
+                    livefeed.broadcast(by_stream)
+            except Exception:
+                logger.exception('Could not publish %d audit log entries to the live feed', len(logs))
+            return len(logs)
+
+    def _write_each(self, batch: List[Dict[str, Any]], states: List[Any]):
+        # One bad row (an oversized value, say) should not cost the rest of the batch.
+        from .models import AuditLog
+
+        logs, kept = [], []
+        for entry, state in zip(batch, states):
+            try:
+                logs.extend(AuditLog.objects.bulk_create([AuditLog(**entry)]))
+                kept.append(state)
+            except Exception:
+                self.dropped += 1
+                logger.exception('Dropped audit log entry %s %s.%s', entry.get('action_type'), entry.get('app_label'), entry.get('model_name'))
+        return logs, kept
+
+    def close(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        self.flush()
+
+
+buffer = AuditBuffer(
+    flush_size=getattr(settings, 'DASHBOARD_AUDIT_FLUSH_SIZE', 200),
+    flush_interval=getattr(settings, 'DASHBOARD_AUDIT_FLUSH_INTERVAL', 1.0),
+    max_pending=getattr(settings, 'DASHBOARD_AUDIT_MAX_PENDING', 10000),
+)
+atexit.register(buffer.close)
+
+
+def record(action_type: str, app_label: str, model_name: str, object_id=None, user=None, state=None, **fields) -> None:
+    """Queue one AuditLog row once the surrounding transaction commits.
+
+    User, IP address and user agent default to those of the request being
+    served. ``state`` is the object's full state after the event, kept only
+    for periodic snapshots. Remaining keyword arguments are AuditLog fields.
+    """
+    entry = {
+        'timestamp': now(),
+        'action_type': action_type,
+        'app_label': app_label,
+        'model_name': model_name,
+        'object_id': None if object_id is None else str(object_id),
+        'state': state,
+        **fields,
+    }
+    request = current_request.get()
+    if request is not None:
+        entry.setdefault('ip_address', _client_ip(request))
+        entry.setdefault('user_agent', (request.META.get('HTTP_USER_AGENT') or '')[:512] or None)
+        if user is None:
+            user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        entry['user_id'] = user.pk
+    transaction.on_commit(lambda: buffer.append(entry))
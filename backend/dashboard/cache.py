@@ -0,0 +1,72 @@
+import math
+import random
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from django.core.cache import cache
+
+
+STAT_NAMES = ('hit', 'stale', 'miss')
+
+
+def _bump(stat: str) -> None:
+    key = f'dashboard:cache_stats:{stat}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def cache_stats() -> Dict[str, int]:
+    values = cache.get_many([f'dashboard:cache_stats:{s}' for s in STAT_NAMES])
+    return {s: values.get(f'dashboard:cache_stats:{s}', 0) for s in STAT_NAMES}
+
+
+def get_or_compute(
+    key: str,
+    compute: Callable[[], Any],
+    ttl: float,
+    stale_ttl: float = 600,
+    beta: float = 1.0,
+    lock_timeout: int = 30,
+    wait: float = 2.0,
+) -> Tuple[Any, str]:
+    """Return ``(value, status)`` for ``key``, recomputing at most once at a time.
+
+    Entries stay in the cache ``stale_ttl`` seconds past their logical expiry.
+    Each reader refreshes early with a probability that grows as expiry
+    approaches, scaled by how long the last computation took (XFetch). Only
+    the reader that wins the lock recomputes; everyone else keeps serving the
+    stale value. On a cold key, losers wait up to ``wait`` seconds for the
+    winner before computing themselves.
+    """
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+    if entry is not None:
+        early = entry['delta'] * beta * -math.log(1.0 - random.random())
+        if time.time() + early < entry['expires']:
+            _bump('hit')
+            return entry['value'], 'hit'
+    locked = cache.add(lock_key, 1, timeout=lock_timeout)
+    if not locked:
+        if entry is not None:
+            _bump('stale')
+            return entry['value'], 'stale'
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                _bump('stale')
+                return entry['value'], 'stale'
+
+    _bump('miss')
+    try:
+        started = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - started
+        cache.set(key, {'value': value, 'delta': delta, 'expires': time.time() + ttl}, timeout=ttl + stale_ttl)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value, 'miss'
@@ -0,0 +1,28 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from accounts.authentication import StatelessJWTAuthentication
+
+
+def _user_from_token(raw):
+    auth = StatelessJWTAuthentication()
+    try:
+        return auth.get_user(auth.get_validated_token(raw))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+class JWTQueryAuthMiddleware(BaseMiddleware):
+    """Authenticate a websocket from its ``?token=<access JWT>``, since browsers cannot set headers on it."""
+
+    async def __call__(self, scope, receive, send):
+        token = parse_qs(scope.get('query_string', b'').decode()).get('token')
+        if token:
+            user = await database_sync_to_async(_user_from_token)(token[0])
+            if user is not None:
+                scope = dict(scope, user=user)
+        return await super().__call__(scope, receive, send)
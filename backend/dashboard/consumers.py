@@ -1,22 +1,100 @@
+import asyncio
+import time
+from collections import deque
 from typing import Any
+
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+
+TICK = getattr(settings, 'DASHBOARD_LIVE_FEED_TICK', 0.25)
+QUEUE_SIZE = getattr(settings, 'DASHBOARD_LIVE_FEED_QUEUE', 1000)
+# 'oldest' drops the oldest queued events; 'collapse' drops the whole backlog. Either way a "missed" marker follows.
+DROP_POLICY = getattr(settings, 'DASHBOARD_LIVE_FEED_DROP', 'collapse')
+RATE = getattr(settings, 'DASHBOARD_LIVE_FEED_RATE', 400)
+SEND_TIMEOUT = getattr(settings, 'DASHBOARD_LIVE_FEED_SEND_TIMEOUT', 5)
+MAX_BEHIND = getattr(settings, 'DASHBOARD_LIVE_FEED_MAX_BEHIND', 30)
+# A client counts as caught up only once its queue is empty and it has not overflowed for this long.
+RECOVER = getattr(settings, 'DASHBOARD_LIVE_FEED_RECOVER', 5)
+CLOSE_TOO_SLOW = 4008
 
 
 class LiveFeedConsumer(AsyncJsonWebsocketConsumer):
+    """Feed of audit events for one app (or ``all``).
+
+    Group messages only go into a bounded per-connection queue; a ticker
+    sends at most ``RATE`` events per second as one frame per ``TICK``. When
+    the queue overflows, events are dropped per ``DROP_POLICY``. A client
+    that keeps a backlog or keeps overflowing (with no ``RECOVER`` second
+    gap) for ``MAX_BEHIND`` seconds, or whose socket blocks a send for
+    ``SEND_TIMEOUT`` seconds, is disconnected. Collapsing empties the queue,
+    so an empty queue alone does not mean the client has caught up.
+    """
+
     async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+        self.app = self.scope['url_route']['kwargs'].get('app', 'all')
+        self.group_name = f"livefeed_{self.app}"
+        self.pending = deque(maxlen=QUEUE_SIZE)
+        self.missed = 0
+        self.behind_since = None
+        self.last_overflow = None
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
-        app = self.scope['url_route']['kwargs'].get('app', 'all')
-        group = f"livefeed_{app}"
-        self.group_name = group
-        await self.channel_layer.group_add(group, self.channel_name)
+        self.ticker = asyncio.create_task(self._tick())
 
     async def disconnect(self, code):
+        if hasattr(self, 'ticker'):
+            self.ticker.cancel()
         if hasattr(self, 'group_name'):
             await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
     async def receive_json(self, content: Any, **kwargs):
         pass
 
+    async def stream_batch(self, message):
+        self._enqueue(message['events'])
+
     async def stream_event(self, event):
-        await self.send_json(event.get('data', {}))
+        self._enqueue([event.get('data', {})])
+
+    def _enqueue(self, events):
+        overflow = len(self.pending) + len(events) - QUEUE_SIZE
+        if overflow > 0:
+            self.last_overflow = time.monotonic()
+            if self.behind_since is None:
+                self.behind_since = self.last_overflow
+            if DROP_POLICY == 'collapse':
+                self.missed += len(self.pending) + len(events)
+                self.pending.clear()
+                return
+            self.missed += overflow
+        self.pending.extend(events)
 
+    async def _tick(self):
+        budget = max(1, int(RATE * TICK))
+        while True:
+            await asyncio.sleep(TICK)
+            if self.behind_since is not None and time.monotonic() - self.behind_since > MAX_BEHIND:
+                await self.close(code=CLOSE_TOO_SLOW)
+                return
+            frames = []
+            if self.missed:
+                # Tell the client what it lost so it can refetch from the live-events endpoint.
+                frames.append({'type': 'missed', 'app': self.app, 'count': self.missed})
+                self.missed = 0
+            if self.pending:
+                count = min(budget, len(self.pending))
+                events = [self.pending.popleft() for _ in range(count)]
+                frames.append({'type': 'events', 'app': self.app, 'events': events})
+            if not self.pending and (self.last_overflow is None or time.monotonic() - self.last_overflow > RECOVER):
+                self.behind_since = None
+            try:
+                for frame in frames:
+                    await asyncio.wait_for(self.send_json(frame), SEND_TIMEOUT)
+            except asyncio.TimeoutError:
+                await self.close(code=CLOSE_TOO_SLOW)
+                return
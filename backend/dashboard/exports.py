@@ -0,0 +1,83 @@
+import csv
+import zlib
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+
+CSV_HEADER = ('timestamp', 'user', 'action_type', 'app_label', 'model_name', 'object_id', 'ip_address')
+CSV_FIELDS = ('timestamp', 'user_id', 'action_type', 'app_label', 'model_name', 'object_id', 'ip_address')
+
+NDJSON_KEYS = (
+    'id', 'timestamp', 'user', 'action_type', 'app_label', 'model_name',
+    'object_id', 'ip_address', 'user_agent', 'data_before', 'data_after', 'metadata',
+)
+NDJSON_FIELDS = tuple('user_id' if k == 'user' else k for k in NDJSON_KEYS)
+DATA_KEYS = ('data_before', 'data_after')
+# Without change data the JSON columns are not selected at all.
+REDACTED_KEYS = tuple(k for k in NDJSON_KEYS if k not in DATA_KEYS)
+REDACTED_FIELDS = tuple(f for f in NDJSON_FIELDS if f not in DATA_KEYS)
+
+_encode = DjangoJSONEncoder(separators=(',', ':')).encode
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each encoded row back."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(queryset: QuerySet, chunk_size: int = 2000) -> Iterator[str]:
+    """Yield the queryset as CSV, ``chunk_size`` rows per piece.
+
+    Rows come from a server-side cursor over ``values_list``, so memory stays
+    flat no matter how many rows match.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    lines = []
+    for timestamp, *rest in queryset.values_list(*CSV_FIELDS).iterator(chunk_size=chunk_size):
+        lines.append(writer.writerow([timestamp.isoformat(), *rest]))
+        if len(lines) >= chunk_size:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def ndjson_line(values, include_data: bool = True) -> str:
+    """Encode one ``NDJSON_FIELDS`` row (``REDACTED_FIELDS`` without data) as a JSON line."""
+    if include_data:
+        return _encode(dict(zip(NDJSON_KEYS, values))) + '\n'
+    row = dict.fromkeys(NDJSON_KEYS)
+    row.update(zip(REDACTED_KEYS, values))
+    return _encode(row) + '\n'
+
+
+def stream_ndjson(queryset: QuerySet, include_data: bool, chunk_size: int = 2000) -> Iterator[str]:
+    """Yield one JSON object per line, with the same keys as AuditLogSerializer.
+
+    ``data_before``/``data_after`` are null unless ``include_data`` is set,
+    matching the serializer's redaction; they are then not selected either.
+    """
+    fields = NDJSON_FIELDS if include_data else REDACTED_FIELDS
+    lines = []
+    for values in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        lines.append(ndjson_line(values, include_data))
+        if len(lines) >= chunk_size:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def gzip_stream(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+    """Compress a text stream incrementally into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
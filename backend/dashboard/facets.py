@@ -0,0 +1,128 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple
+
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils.timezone import now
+
+from .metrics import ROLLUP_TZ
+from .models import AuditLog, AuditLogDailyCount
+
+
+FACETS = ('action_type', 'app_label', 'model_name')
+
+Combo = Tuple[str, str, str]
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=ROLLUP_TZ)
+
+
+def _local_date(dt: datetime) -> date:
+    return dt.astimezone(ROLLUP_TZ).date()
+
+
+def rollup_audit_counts(end: Optional[datetime] = None) -> int:
+    """Store per-day counts for every complete Asia/Kolkata day before ``end``.
+
+    Resumes from the latest stored day, which is recomputed so events flushed
+    after the previous run are picked up. The first run covers the whole log.
+    """
+    last_day = _local_date(end or now()) - timedelta(days=1)
+    latest = AuditLogDailyCount.objects.aggregate(latest=Max('date'))['latest']
+    if latest is None:
+        first = AuditLog.objects.aggregate(first=Min('timestamp'))['first']
+        if first is None:
+            return 0
+        latest = _local_date(first)
+    if latest > last_day:
+        return 0
+    return _count_days(latest, last_day)
+
+
+def _count_days(first: date, last: date) -> int:
+    rows = (
+        AuditLog.objects.filter(timestamp__gte=_day_start(first), timestamp__lt=_day_start(last + timedelta(days=1)))
+        .annotate(date=TruncDate('timestamp', tzinfo=ROLLUP_TZ))
+        .values('date', *FACETS)
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    counts = [AuditLogDailyCount(**row) for row in rows]
+    AuditLogDailyCount.objects.bulk_create(
+        counts,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['date', *FACETS],
+        update_fields=['count'],
+    )
+    return len(counts)
+
+
+def prune_audit_counts(cutoff: datetime) -> int:
+    """Drop daily counts for days archived away before ``cutoff``.
+
+    The day containing ``cutoff`` lost only part of its rows, so it is
+    recounted from what is left if it had been rolled up.
+    """
+    day = _local_date(cutoff)
+    latest = AuditLogDailyCount.objects.aggregate(latest=Max('date'))['latest']
+    deleted, _ = AuditLogDailyCount.objects.filter(date__lte=day).delete()
+    if latest is not None and latest > day:
+        _count_days(day, day)
+    return deleted
+
+
+def _live(combos: Counter, queryset) -> None:
+    for row in queryset.values(*FACETS).annotate(count=Count('id')).order_by():
+        combos[tuple(row[f] for f in FACETS)] += row['count']
+
+
+def facet_counts(queryset, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                 filters: Optional[Dict[str, str]] = None, live_only: bool = False) -> Dict:
+    """Counts per value of each facet, for rows of ``queryset`` with timestamp in ``[start, end)``.
+
+    Whole days already rolled up come from ``AuditLogDailyCount``; the partial
+    days at either edge (including today) are counted live. Each facet
+    applies the other facets' ``filters`` but not its own, so every option
+    shows how many rows selecting it would give. ``live_only`` forces a live
+    count, for filters the daily table cannot answer (user, search).
+    """
+    filters = {k: v for k, v in (filters or {}).items() if v}
+    end = end or now()
+    combos: Counter = Counter()
+    # Facet filters are applied per facet below, never to the scan itself.
+    scoped = queryset.filter(timestamp__lt=end)
+    if start is not None:
+        scoped = scoped.filter(timestamp__gte=start)
+
+    rolled_up = AuditLogDailyCount.objects.aggregate(latest=Max('date'))['latest']
+    first_day = _local_date(start) if start else None
+    if first_day is not None and _day_start(first_day) < start:
+        first_day += timedelta(days=1)
+    last_day = _local_date(end) - timedelta(days=1)
+    if rolled_up is not None:
+        last_day = min(last_day, rolled_up)
+
+    if live_only or rolled_up is None or (first_day is not None and first_day > last_day):
+        _live(combos, scoped)
+    else:
+        daily = AuditLogDailyCount.objects.filter(date__lte=last_day)
+        if first_day is not None:
+            daily = daily.filter(date__gte=first_day)
+            _live(combos, scoped.filter(timestamp__lt=_day_start(first_day)))
+        for row in daily.values(*FACETS).annotate(total=Sum('count')).order_by():
+            combos[tuple(row[f] for f in FACETS)] += row['total']
+        _live(combos, scoped.filter(timestamp__gte=_day_start(last_day + timedelta(days=1))))
+
+    facets: Dict[str, Dict[str, int]] = {name: defaultdict(int) for name in FACETS}
+    total = 0
+    for combo, count in combos.items():
+        misses = [name for name, value in zip(FACETS, combo) if name in filters and filters[name] != value]
+        if not misses:
+            total += count
+        for index, name in enumerate(FACETS):
+            if not misses or misses == [name]:
+                facets[name][combo[index]] += count
+    return {'total': total, 'facets': {name: dict(values) for name, values in facets.items()}}
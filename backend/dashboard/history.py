@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import AuditLog, AuditSnapshot
+
+
+SNAPSHOT_EVERY = getattr(settings, 'DASHBOARD_AUDIT_SNAPSHOT_EVERY', 50)
+COUNTER_TTL = 30 * 24 * 3600
+STATE_ACTIONS = ('CREATE', 'UPDATE', 'DELETE')
+
+
+def _counter_key(log) -> str:
+    return f'dashboard:audit:since_snapshot:{log.app_label}:{log.model_name}:{log.object_id}'
+
+
+def record_snapshots(logs: List[AuditLog], states: List[Optional[Dict[str, Any]]]) -> int:
+    """Store a full snapshot for each object that reached ``SNAPSHOT_EVERY`` events since its last one.
+
+    ``states`` holds each log's full object state after the event, or None
+    (an update saved with deferred fields). Every state event counts; a
+    snapshot that falls due on an event without a state is taken at the next
+    one that has it. Creations always snapshot, and so does an object whose
+    counter was lost from the cache, which only makes snapshots more frequent.
+    """
+    pairs = [(log, state) for log, state in zip(logs, states) if log.action_type in STATE_ACTIONS and log.object_id]
+    if not pairs:
+        return 0
+    counts = cache.get_many({_counter_key(log) for log, _ in pairs})
+    snapshots = []
+    for log, state in pairs:
+        key = _counter_key(log)
+        count = counts.get(key)
+        due = log.action_type == 'CREATE' or count is None or count + 1 >= SNAPSHOT_EVERY
+        if due and state is not None:
+            snapshots.append(AuditSnapshot(
+                app_label=log.app_label, model_name=log.model_name, object_id=log.object_id,
+                timestamp=log.timestamp, log_id=log.pk, state=state,
+            ))
+            counts[key] = 0
+        else:
+            counts[key] = SNAPSHOT_EVERY if count is None else count + 1
+    AuditSnapshot.objects.bulk_create(snapshots)
+    cache.set_many(counts, COUNTER_TTL)
+    return len(snapshots)
+
+
+def state_at(app_label: str, model_name: str, object_id: str, at: datetime) -> Dict[str, Any]:
+    """Object state as of ``at``: the nearest earlier snapshot plus the diffs logged after it.
+
+    ``state`` is None if the object did not exist yet or was deleted by then.
+    ``complete`` is false when updates were replayed onto an unknown base (no
+    snapshot or creation before them), so ``state`` holds only the fields
+    those updates changed.
+    """
+    obj = {'app_label': app_label, 'model_name': model_name, 'object_id': object_id}
+    snapshot = AuditSnapshot.objects.filter(**obj, timestamp__lte=at).first()
+    logs = AuditLog.objects.filter(**obj, action_type__in=STATE_ACTIONS, timestamp__lte=at)
+    state = None
+    known = snapshot is not None
+    complete = True
+    if snapshot is not None:
+        state = dict(snapshot.state)
+        logs = logs.filter(Q(timestamp__gt=snapshot.timestamp) | Q(timestamp=snapshot.timestamp, id__gt=snapshot.log_id))
+    replayed = 0
+    for action_type, data_after in logs.order_by('timestamp', 'id').values_list('action_type', 'data_after'):
+        replayed += 1
+        if action_type == 'DELETE':
+            state, known, complete = None, True, True
+        elif action_type == 'CREATE':
+            state, known, complete = dict(data_after or {}), True, True
+        else:
+            complete = complete and known
+            state = {**(state or {}), **(data_after or {})}
+    return {
+        **obj,
+        'at': at,
+        'exists': state is not None,
+        'complete': complete,
+        'state': state,
+        'snapshot_at': snapshot.timestamp if snapshot else None,
+        'events_replayed': replayed,
+    }
@@ -0,0 +1,115 @@
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+ALL = 'all'
+LIVE_ACTIONS = ('CREATE', 'UPDATE', 'DELETE')
+SIZE = getattr(settings, 'DASHBOARD_LIVE_EVENTS_SIZE', 100)
+MESSAGE_EVENTS = 500
+TTL = 24 * 3600
+LOCK_TIMEOUT = 5
+LOCK_WAIT = 2
+
+
+def _ring_key(stream: str) -> str:
+    return f'dashboard:live:{stream}'
+
+
+def _lock_key(stream: str) -> str:
+    return f'dashboard:live:{stream}:lock'
+
+
+def event_payload(log) -> Dict[str, Any]:
+    """Live feed view of an AuditLog row; change data is never included."""
+    return {
+        'id': log.pk,
+        'seq': None,
+        'timestamp': log.timestamp.isoformat(),
+        'user': log.user_id,
+        'action_type': log.action_type,
+        'app_label': log.app_label,
+        'model_name': log.model_name,
+        'object_id': log.object_id,
+        'ip_address': log.ip_address,
+        'user_agent': log.user_agent,
+        'data_before': None,
+        'data_after': None,
+        'metadata': log.metadata,
+    }
+
+
+def _append(stream: str, events: List[Dict[str, Any]]) -> None:
+    # Read-modify-write of one value, so writers in other processes take turns.
+    lock = _lock_key(stream)
+    deadline = time.monotonic() + LOCK_WAIT
+    locked = cache.add(lock, 1, timeout=LOCK_TIMEOUT)
+    while not locked and time.monotonic() < deadline:
+        time.sleep(0.01)
+        locked = cache.add(lock, 1, timeout=LOCK_TIMEOUT)
+    try:
+        ring = cache.get(_ring_key(stream)) or {'head': 0, 'events': []}
+        head = ring['head']
+        for seq, payload in enumerate(events, start=head + 1):
+            payload['seq'] = seq
+        ring = {'head': head + len(events), 'events': (ring['events'] + events)[-SIZE:]}
+        cache.set(_ring_key(stream), ring, TTL)
+    finally:
+        if locked:
+            cache.delete(lock)
+
+
+def publish(logs: Iterable) -> Dict[str, List[Dict[str, Any]]]:
+    """Append CREATE/UPDATE/DELETE rows to the per-app and ``all`` rings.
+
+    Each stream's ring is one cache value holding its head sequence number
+    and last ``SIZE`` events, so a culling cache evicts whole rings rather
+    than the counters that cursors depend on. Returns the published payloads
+    (with ``seq`` set) by stream.
+    """
+    by_stream: Dict[str, List[Dict[str, Any]]] = {}
+    for log in logs:
+        if log.action_type not in LIVE_ACTIONS:
+            continue
+        payload = event_payload(log)
+        by_stream.setdefault(log.app_label, []).append(payload)
+        by_stream.setdefault(ALL, []).append(dict(payload))
+    for stream, events in by_stream.items():
+        _append(stream, events)
+    return by_stream
+
+
+def recent(stream: str = ALL, after: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Events in ``stream`` newer than ``after``, newest first, and the cursor for the next poll.
+
+    A head below ``after`` means the ring was evicted or expired and restarted,
+    so the whole ring is returned.
+    """
+    ring = cache.get(_ring_key(stream)) or {'head': 0, 'events': []}
+    if ring['head'] < after:
+        after = 0
+    return [e for e in reversed(ring['events']) if e['seq'] > after], ring['head']
+
+
+def broadcast(by_stream: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Send published events to the ``livefeed_<stream>`` channel groups, one message per chunk."""
+    try:
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+    except ImportError:
+        return
+    layer = get_channel_layer()
+    if layer is None or not by_stream:
+        return
+
+    async def send_all():
+        for stream, events in by_stream.items():
+            for start in range(0, len(events), MESSAGE_EVENTS):
+                await layer.group_send(
+                    f'livefeed_{stream}',
+                    {'type': 'stream.batch', 'events': events[start:start + MESSAGE_EVENTS]},
+                )
+
+    async_to_sync(send_all)()
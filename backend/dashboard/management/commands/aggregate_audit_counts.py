@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from dashboard.facets import rollup_audit_counts
+
+
+class Command(BaseCommand):
+    help = 'Store per-day AuditLog facet counts for complete days (same as the aggregate_audit_counts task)'
+
+    def handle(self, *args, **options):
+        stored = rollup_audit_counts()
+        self.stdout.write(self.style.SUCCESS(f'Stored {stored} daily counts'))
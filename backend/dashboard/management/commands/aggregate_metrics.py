@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from dashboard.metrics import rollup_metrics
+
+
+class Command(BaseCommand):
+    help = 'Roll raw rows up into hourly MetricRollup buckets (same as the aggregate_metrics task)'
+
+    def handle(self, *args, **options):
+        written = rollup_metrics()
+        self.stdout.write(self.style.SUCCESS(
+            'Rolled up ' + (', '.join(f'{name}: {count}' for name, count in written.items()) or 'nothing')
+        ))
@@ -1,16 +1,104 @@
+import gzip
+import json
+import os
+import time
 from datetime import timedelta
+from pathlib import Path
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils.dateparse import parse_datetime
 from django.utils.timezone import now
+from dashboard.exports import NDJSON_FIELDS, ndjson_line
+from dashboard.facets import prune_audit_counts
 from dashboard.models import AuditLog
+from dashboard.partitions import PARENT, drop_partition, ensure_partitions, expired_partitions
 
 
 class Command(BaseCommand):
-    help = 'Archive audit logs older than 365 days'
+    help = 'Archive audit logs past retention to gzip JSONL files, then delete them and drop expired partitions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'DASHBOARD_AUDIT_RETENTION_DAYS', 365))
+        parser.add_argument(
+            '--archive-dir',
+            default=getattr(settings, 'DASHBOARD_AUDIT_ARCHIVE_DIR', settings.BASE_DIR / 'archive' / 'audit_logs'),
+        )
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--max-file-mb', type=int, default=256, help='Start a new archive file past this size')
+        parser.add_argument('--max-seconds', type=float, default=0, help='Stop after this long and resume next run (0 = no limit)')
 
     def handle(self, *args, **options):
-        cutoff = now() - timedelta(days=365)
-        qs = AuditLog.objects.filter(timestamp__lt=cutoff)
-        count = qs.count()
-        qs.delete()
-        self.stdout.write(self.style.SUCCESS(f'Archived {count} audit logs'))
+        started = time.monotonic()
+        archive_dir = Path(options['archive_dir'])
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        checkpoint_path = archive_dir / 'checkpoint.json'
+
+        # A checkpoint pins the cutoff, so a resumed run finishes the same set of rows.
+        state = {'cutoff': (now() - timedelta(days=options['days'])).isoformat(), 'last_id': 0, 'file_seq': 0}
+        if checkpoint_path.exists():
+            state = json.loads(checkpoint_path.read_text())
+            self.stdout.write(f"Resuming after id {state['last_id']}")
+        cutoff = parse_datetime(state['cutoff'])
+
+        # Rows in partitions that will be dropped wholesale are archived but not deleted row by row.
+        droppable = expired_partitions(cutoff)
+        max_bytes = options['max_file_mb'] * 1024 * 1024
+        archived = 0
+        while True:
+            if options['max_seconds'] and time.monotonic() - started >= options['max_seconds']:
+                self.stdout.write(self.style.WARNING(
+                    f"Time budget used after {archived} rows; next run resumes after id {state['last_id']}"
+                ))
+                return
+
+            rows = list(
+                AuditLog.objects.filter(id__gt=state['last_id'], timestamp__lt=cutoff)
+                .order_by('id')
+                .values_list(*NDJSON_FIELDS)[:options['chunk_size']]
+            )
+            if not rows:
+                break
+
+            path = archive_dir / f"audit_logs_{cutoff:%Y%m%d}_{state['file_seq']:05d}.jsonl.gz"
+            if path.exists() and path.stat().st_size >= max_bytes:
+                state['file_seq'] += 1
+                path = archive_dir / f"audit_logs_{cutoff:%Y%m%d}_{state['file_seq']:05d}.jsonl.gz"
+            # Each chunk is its own gzip member, so the file is valid gzip after every fsync.
+            with open(path, 'ab') as fh:
+                fh.write(gzip.compress(''.join(ndjson_line(row) for row in rows).encode('utf-8')))
+                fh.flush()
+                os.fsync(fh.fileno())
+
+            self._delete_chunk([row[0] for row in rows], cutoff, droppable)
+            state['last_id'] = rows[-1][0]
+            self._write_checkpoint(checkpoint_path, state)
+            archived += len(rows)
+
+        for name in droppable:
+            drop_partition(name)
+            self.stdout.write(f'Dropped {name}')
+        created = ensure_partitions()
+        pruned = prune_audit_counts(cutoff)
+        checkpoint_path.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {archived} audit logs, dropped {len(droppable)} and created {len(created)} partitions, '
+            f'pruned {pruned} daily counts'
+        ))
+
+    def _delete_chunk(self, ids, cutoff, droppable):
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {qn(PARENT)} WHERE id = ANY(%s) AND "timestamp" < %s '
+                f'AND NOT (tableoid::regclass::text = ANY(%s))',
+                [ids, cutoff, droppable],
+            )
 
+    def _write_checkpoint(self, path, state):
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w') as fh:
+            json.dump(state, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
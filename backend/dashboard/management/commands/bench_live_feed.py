@@ -0,0 +1,122 @@
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+
+from asgiref.testing import ApplicationCommunicator
+from channels.layers import DEFAULT_CHANNEL_LAYER, InMemoryChannelLayer, channel_layers
+from django.core.management.base import BaseCommand
+from dashboard import consumers
+from dashboard.consumers import LiveFeedConsumer
+
+
+class _BenchUser:
+    is_authenticated = True
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = 'Load-test LiveFeedConsumer with simulated websocket clients on an in-memory channel layer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=1000)
+        parser.add_argument('--apps', type=int, default=1, help='Spread clients over this many app groups')
+        parser.add_argument('--rate', type=float, default=200, help='Events per second published to each group')
+        parser.add_argument('--batch', type=int, default=20, help='Events per group message, like one audit flush')
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument('--capacity', type=int, default=100, help='Channel layer capacity per channel')
+
+    def handle(self, *args, **options):
+        layer = InMemoryChannelLayer(capacity=options['capacity'])
+        channel_layers.set(DEFAULT_CHANNEL_LAYER, layer)
+        report = asyncio.run(self._run(layer, options))
+        for line in report:
+            self.stdout.write(line)
+
+    async def _run(self, layer, options):
+        apps = [f'bench{i}' for i in range(options['apps'])]
+        latencies = []
+        stats = {'frames': 0, 'events': 0, 'missed': 0, 'closed': 0}
+        application = LiveFeedConsumer.as_asgi()
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        clients = []
+        for i in range(options['clients']):
+            app = apps[i % len(apps)]
+            scope = {
+                'type': 'websocket', 'path': f'/ws/dashboard/live-events/{app}/', 'headers': [],
+                'subprotocols': [], 'user': _BenchUser(), 'url_route': {'args': (), 'kwargs': {'app': app}},
+            }
+            client = ApplicationCommunicator(application, scope)
+            await client.send_input({'type': 'websocket.connect'})
+            accepted = await client.receive_output(timeout=10)
+            if accepted['type'] != 'websocket.accept':
+                raise RuntimeError(f'client {i} was not accepted: {accepted}')
+            clients.append(client)
+        per_connection = (tracemalloc.get_traced_memory()[0] - baseline) / max(len(clients), 1)
+        tracemalloc.stop()
+
+        async def receive(client):
+            while True:
+                message = await client.output_queue.get()
+                received = time.perf_counter()
+                if message['type'] == 'websocket.close':
+                    stats['closed'] += 1
+                    return
+                frame = json.loads(message['text'])
+                stats['frames'] += 1
+                if frame['type'] == 'missed':
+                    stats['missed'] += frame['count']
+                    continue
+                stats['events'] += len(frame['events'])
+                latencies.extend(received - event['sent_at'] for event in frame['events'])
+
+        async def publish():
+            interval = options['batch'] / options['rate']
+            published = 0
+            deadline = time.perf_counter() + options['duration']
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                for app in apps:
+                    events = [{'seq': published + n, 'sent_at': time.perf_counter()} for n in range(options['batch'])]
+                    await layer.group_send(f'livefeed_{app}', {'type': 'stream.batch', 'events': events})
+                published += options['batch']
+                await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+            return published
+
+        receivers = [asyncio.create_task(receive(client)) for client in clients]
+        started = time.perf_counter()
+        published = await publish()
+        # Drain: wait until delivery stops making progress.
+        delivered = -1
+        while stats['events'] != delivered:
+            delivered = stats['events']
+            await asyncio.sleep(consumers.TICK * 2)
+        elapsed = time.perf_counter() - started
+        for task in receivers:
+            task.cancel()
+        for client in clients:
+            client.future.cancel()
+        await asyncio.gather(*receivers, *(client.future for client in clients), return_exceptions=True)
+
+        expected = published * len(clients)
+        return [
+            f"clients={len(clients)} apps={len(apps)} rate={options['rate']}/s per group "
+            f"batch={options['batch']} elapsed={elapsed:.1f}s tick={consumers.TICK}s",
+            f'events delivered {stats["events"]}/{expected}, missed {stats["missed"]}, closed {stats["closed"]}',
+            f'frames/s {stats["frames"] / elapsed:.0f}, events/s {stats["events"] / elapsed:.0f}',
+            'fan-out latency ms p50 {:.1f} p90 {:.1f} p99 {:.1f} max {:.1f} mean {:.1f}'.format(
+                _percentile(latencies, 50) * 1000, _percentile(latencies, 90) * 1000,
+                _percentile(latencies, 99) * 1000, max(latencies, default=0) * 1000,
+                (statistics.fmean(latencies) if latencies else 0) * 1000,
+            ),
+            f'memory per connection {per_connection / 1024:.1f} KiB',
+        ]
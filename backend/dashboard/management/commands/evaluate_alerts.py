@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from dashboard.alerts import evaluate_alert_rules
+
+
+class Command(BaseCommand):
+    help = 'Evaluate active alert rules and open or refresh incidents (same as the evaluate_alerts task)'
+
+    def handle(self, *args, **options):
+        result = evaluate_alert_rules()
+        self.stdout.write(self.style.SUCCESS(', '.join(f'{key}: {value}' for key, value in result.items())))
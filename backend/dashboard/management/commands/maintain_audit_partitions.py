@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from dashboard.partitions import ensure_partitions
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly AuditLog partitions (same as the maintain_audit_partitions task)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=3)
+
+    def handle(self, *args, **options):
+        created = ensure_partitions(options['months_ahead'])
+        self.stdout.write(self.style.SUCCESS(f"Created {len(created)} partitions{': ' + ', '.join(created) if created else ''}"))
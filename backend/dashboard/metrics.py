@@ -0,0 +1,259 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import Trunc, TruncHour
+from django.utils.timezone import now
+
+from .models import MetricRollup
+
+
+ROLLUP_TZ = ZoneInfo('Asia/Kolkata')
+BUCKET = timedelta(hours=1)
+
+# (longest span, resolution, step): series pick the first resolution whose span fits.
+RESOLUTIONS = (
+    (timedelta(hours=48), 'hour', BUCKET),
+    (timedelta(days=90), 'day', timedelta(days=1)),
+    (None, 'week', timedelta(weeks=1)),
+)
+
+# metric_name -> where its raw rows live. Counts by default, sums when `sum` is set.
+# `live` metrics are not additive over buckets (a user's last_login moves on every
+# login), so they are never rolled up and are counted from the source instead.
+METRICS: Dict[str, Dict] = {
+    'active_users': {'model': 'accounts.CustomUser', 'filter': {'is_active': True}, 'time_field': 'last_login', 'live': True},
+    'new_signups': {'model': 'accounts.CustomUser', 'time_field': 'date_joined'},
+    'revenue': {'model': 'payments.Payment', 'filter': {'status': 'SUCCESS'}, 'time_field': 'timestamp', 'sum': 'amount'},
+    'failed_payments': {'model': 'payments.Payment', 'filter': {'status': 'FAILED'}, 'time_field': 'timestamp'},
+    'enrollments': {'model': 'enrollments.Enrollment', 'time_field': 'created_at'},
+    'completions': {'model': 'enrollments.Enrollment', 'filter': {'status': 'completed'}, 'time_field': 'updated_at'},
+    'concurrent_live_viewers': {'model': 'live_app.LiveViewer', 'time_field': 'timestamp', 'sum': 'viewer_count'},
+}
+
+
+def get_source_model(label: str):
+    try:
+        return apps.get_model(label)
+    except LookupError:
+        return None
+
+
+def available_metrics() -> List[str]:
+    return [name for name, spec in METRICS.items() if get_source_model(spec['model']) is not None]
+
+
+def _split(names: Iterable[str]) -> Tuple[List[str], List[str]]:
+    names = list(names)
+    return [n for n in names if not METRICS[n].get('live')], [n for n in names if METRICS[n].get('live')]
+
+
+def bucket_floor(dt: datetime) -> datetime:
+    """Start of the Asia/Kolkata hour containing ``dt``."""
+    return dt.astimezone(ROLLUP_TZ).replace(minute=0, second=0, microsecond=0)
+
+
+def compute_buckets(metric_name: str, start: datetime, end: datetime) -> Dict[datetime, float]:
+    """Hourly values of ``metric_name`` from its raw rows in ``[start, end)``, one GROUP BY query."""
+    spec = METRICS[metric_name]
+    model = get_source_model(spec['model'])
+    field = spec['time_field']
+    agg = Sum(spec['sum']) if spec.get('sum') else Count('pk')
+    rows = (
+        model.objects.filter(**spec.get('filter', {}))
+        .filter(**{f'{field}__gte': start, f'{field}__lt': end})
+        .annotate(bucket=TruncHour(field, tzinfo=ROLLUP_TZ))
+        .values('bucket')
+        .annotate(value=agg)
+        .order_by()
+    )
+    return {r['bucket']: float(r['value'] or 0) for r in rows}
+
+
+def rollup_metrics(end: Optional[datetime] = None, metric_names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Incrementally fill ``MetricRollup`` up to the bucket containing ``end``.
+
+    Each metric restarts from its latest stored bucket or
+    ``DASHBOARD_ROLLUP_RECOMPUTE_HOURS`` (default 48) before ``end``, whichever
+    is earlier, so rows that change after their hour was rolled up (a payment
+    turning SUCCESS, an enrollment completed) are picked up. Metrics with no
+    rollups yet are backfilled for ``DASHBOARD_ROLLUP_BACKFILL_DAYS``. Empty
+    buckets are stored as zeros so the next run knows where to resume.
+    ``live`` metrics are skipped.
+    """
+    end = end or now()
+    backfill = timedelta(days=getattr(settings, 'DASHBOARD_ROLLUP_BACKFILL_DAYS', 60))
+    recompute = timedelta(hours=getattr(settings, 'DASHBOARD_ROLLUP_RECOMPUTE_HOURS', 48))
+    names, _ = _split(n for n in (metric_names or METRICS) if n in available_metrics())
+    last = dict(
+        MetricRollup.objects.filter(metric_name__in=names)
+        .values('metric_name')
+        .annotate(last=Max('bucket_start'))
+        .values_list('metric_name', 'last')
+    )
+    upper = bucket_floor(end)
+    written: Dict[str, int] = {}
+    for name in names:
+        first = bucket_floor(min(last[name], end - recompute) if name in last else end - backfill)
+        values = compute_buckets(name, first, upper + BUCKET)
+        rows = []
+        bucket = first
+        while bucket <= upper:
+            rows.append(MetricRollup(metric_name=name, bucket_start=bucket, value=values.get(bucket, 0.0)))
+            bucket += BUCKET
+        MetricRollup.objects.bulk_create(
+            rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['metric_name', 'bucket_start'],
+            update_fields=['value', 'updated_at'],
+        )
+        written[name] = len(rows)
+    return written
+
+
+def rolled_up_at() -> Optional[datetime]:
+    """When ``rollup_metrics`` last wrote buckets, or None if it has never run."""
+    return MetricRollup.objects.aggregate(latest=Max('updated_at'))['latest']
+
+
+def period_stats(metric_names: Iterable[str], prev_start: datetime, start: datetime, end: datetime) -> Dict[str, Tuple[float, float]]:
+    """``{metric_name: (current, prev)}`` for ``[start, end)`` and ``[prev_start, start)``.
+
+    Both windows of every metric come from one conditional aggregation over
+    the rollup buckets, so the query count does not depend on how many
+    metrics or cards are requested. ``live`` metrics add one query per source model.
+    """
+    names, live = _split(metric_names)
+    totals = {name: (0.0, 0.0) for name in names + live}
+    for label, specs in _by_model(live).items():
+        aggregates = {}
+        for name in specs:
+            spec = METRICS[name]
+            field = spec['time_field']
+            base = Q(**spec.get('filter', {}))
+            aggregates[f'{name}__current'] = Count('pk', filter=base & Q(**{f'{field}__gte': start, f'{field}__lt': end}))
+            aggregates[f'{name}__prev'] = Count('pk', filter=base & Q(**{f'{field}__gte': prev_start, f'{field}__lt': start}))
+        row = get_source_model(label).objects.aggregate(**aggregates)
+        for name in specs:
+            totals[name] = (float(row[f'{name}__current'] or 0), float(row[f'{name}__prev'] or 0))
+    rows = (
+        MetricRollup.objects.filter(metric_name__in=names, bucket_start__gte=prev_start, bucket_start__lt=end)
+        .values('metric_name')
+        .annotate(
+            current=Sum('value', filter=Q(bucket_start__gte=start)),
+            prev=Sum('value', filter=Q(bucket_start__lt=start)),
+        )
+        .order_by()
+    )
+    for row in rows:
+        totals[row['metric_name']] = (row['current'] or 0.0, row['prev'] or 0.0)
+    return totals
+
+
+def _by_model(names: Iterable[str]) -> Dict[str, List[str]]:
+    grouped: Dict[str, List[str]] = defaultdict(list)
+    for name in names:
+        grouped[METRICS[name]['model']].append(name)
+    return grouped
+
+
+def pick_resolution(span: timedelta) -> Tuple[str, timedelta]:
+    for limit, resolution, step in RESOLUTIONS:
+        if limit is None or span <= limit:
+            return resolution, step
+    raise AssertionError('unreachable')
+
+
+def truncate(dt: datetime, resolution: str) -> datetime:
+    dt = bucket_floor(dt)
+    if resolution == 'hour':
+        return dt
+    dt = dt.replace(hour=0)
+    if resolution == 'week':
+        dt -= timedelta(days=dt.weekday())
+    return dt
+
+
+def series(metric_names: Iterable[str], start: datetime, end: datetime) -> Dict:
+    """Zero-filled bucketed values of each metric over ``[start, end)``.
+
+    The resolution follows the span of the window. Rollups are re-bucketed in
+    the database with one GROUP BY for all metrics; gaps are filled by
+    scattering the returned rows into preallocated zero arrays.
+    """
+    names, live = _split(metric_names)
+    resolution, step = pick_resolution(end - start)
+    start = truncate(start, resolution)
+    buckets: List[datetime] = []
+    bucket = start
+    while bucket < end:
+        buckets.append(bucket)
+        bucket += step
+
+    bucket_expr = F('bucket_start') if resolution == 'hour' else Trunc('bucket_start', resolution, tzinfo=ROLLUP_TZ)
+    rows = (
+        MetricRollup.objects.filter(metric_name__in=names, bucket_start__gte=start, bucket_start__lt=end)
+        .annotate(bucket=bucket_expr)
+        .values('metric_name', 'bucket')
+        .annotate(value=Sum('value'))
+        .order_by()
+    )
+    position = {b: i for i, b in enumerate(buckets)}
+    values = {name: [0.0] * len(buckets) for name in names + live}
+    for row in rows:
+        i = position.get(row['bucket'])
+        if i is not None:
+            values[row['metric_name']][i] = row['value'] or 0.0
+    for name in live:
+        spec = METRICS[name]
+        field = spec['time_field']
+        live_rows = (
+            get_source_model(spec['model']).objects.filter(**spec.get('filter', {}))
+            .filter(**{f'{field}__gte': start, f'{field}__lt': end})
+            .annotate(bucket=Trunc(field, resolution, tzinfo=ROLLUP_TZ))
+            .values('bucket')
+            .annotate(value=Count('pk'))
+            .order_by()
+        )
+        for row in live_rows:
+            i = position.get(row['bucket'])
+            if i is not None:
+                values[name][i] = float(row['value'])
+    return {'resolution': resolution, 'buckets': buckets, 'series': values}
+
+
+def window_values(windows: Iterable[Tuple[str, int]], end: Optional[datetime] = None) -> Dict[Tuple[str, int], float]:
+    """Raw values for ``(metric_name, window_minutes)`` pairs ending at ``end``.
+
+    Pairs are grouped by source model and each model is read once, with one
+    conditional aggregate per distinct pair, so the query count follows the
+    number of source models rather than the number of callers.
+    """
+    end = end or now()
+    by_model: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+    for name, minutes in set(windows):
+        if name in METRICS and get_source_model(METRICS[name]['model']) is not None:
+            by_model[METRICS[name]['model']].append((name, minutes))
+
+    values: Dict[Tuple[str, int], float] = {}
+    for label, pairs in by_model.items():
+        aggregates = {}
+        scans = []
+        for i, (name, minutes) in enumerate(pairs):
+            spec = METRICS[name]
+            field = spec['time_field']
+            window = Q(**{f'{field}__gte': end - timedelta(minutes=minutes), f'{field}__lt': end})
+            cond = Q(**spec.get('filter', {})) & window
+            aggregates[f'v{i}'] = Sum(spec['sum'], filter=cond) if spec.get('sum') else Count('pk', filter=cond)
+            scans.append(window)
+        row = get_source_model(label).objects.filter(reduce(or_, scans)).aggregate(**aggregates)
+        for i, pair in enumerate(pairs):
+            values[pair] = float(row[f'v{i}'] or 0)
+    return values
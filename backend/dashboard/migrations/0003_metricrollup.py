@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_rename_dashboard_alertrule_metric_active_idx_dashboard_a_metric__60ebe4_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric_name', models.CharField(max_length=100)),
+                ('bucket_start', models.DateTimeField()),
+                ('value', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['metric_name', 'bucket_start'],
+                'constraints': [models.UniqueConstraint(fields=('metric_name', 'bucket_start'), name='dashboard_metricrollup_bucket_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_metricrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alertrule',
+            index=models.Index(fields=['updated_at'], name='dashboard_a_updated_9810eb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['updated_at'], name='dashboard_i_updated_522f02_idx'),
+        ),
+    ]
@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.db import migrations
+
+
+COLUMNS = (
+    'id, "timestamp", action_type, app_label, model_name, object_id, ip_address, '
+    'user_agent, data_before, data_after, metadata, user_id'
+)
+
+COLUMN_DEFINITIONS = """
+    "timestamp" timestamp with time zone NOT NULL,
+    action_type varchar(20) NOT NULL,
+    app_label varchar(100) NOT NULL,
+    model_name varchar(100) NOT NULL,
+    object_id varchar(64) NULL,
+    ip_address inet NULL,
+    user_agent varchar(512) NULL,
+    data_before jsonb NULL,
+    data_after jsonb NULL,
+    metadata jsonb NULL,
+    user_id bigint NULL,
+    search_vector tsvector GENERATED ALWAYS AS (
+        to_tsvector('simple'::regconfig, COALESCE(user_agent, ''))
+        || jsonb_to_tsvector('simple'::regconfig, COALESCE(metadata, '{}'::jsonb), '["string", "numeric"]'::jsonb)
+    ) STORED
+"""
+
+INDEXES = """
+CREATE INDEX dashboard_a_timesta_3a0d49_idx ON dashboard_auditlog ("timestamp");
+CREATE INDEX dashboard_a_action__8126f5_idx ON dashboard_auditlog (action_type);
+CREATE INDEX dashboard_a_app_lab_26b48b_idx ON dashboard_auditlog (app_label, model_name);
+CREATE INDEX dashboard_a_object__25faa4_idx ON dashboard_auditlog (object_id);
+CREATE INDEX dashboard_a_search__db686d_gin ON dashboard_auditlog USING gin (search_vector);
+CREATE INDEX dashboard_auditlog_user_id_17a16419 ON dashboard_auditlog (user_id);
+ALTER TABLE dashboard_auditlog ADD CONSTRAINT dashboard_auditlog_user_id_17a16419_fk_accounts_customuser_id
+    FOREIGN KEY (user_id) REFERENCES accounts_customuser (id) DEFERRABLE INITIALLY DEFERRED;
+"""
+
+# Partitioned tables cannot carry identity columns before PostgreSQL 17, so
+# ids come from a plain owned sequence. The primary key must include the
+# partition key. Months are UTC calendar months; anything outside the
+# pre-created range lands in the default partition.
+PARTITION = f"""
+ALTER TABLE dashboard_auditlog RENAME TO dashboard_auditlog_unpartitioned;
+ALTER TABLE dashboard_auditlog_unpartitioned ALTER COLUMN id DROP IDENTITY IF EXISTS;
+ALTER TABLE dashboard_auditlog_unpartitioned ALTER COLUMN id DROP DEFAULT;
+DROP SEQUENCE IF EXISTS dashboard_auditlog_id_seq;
+
+CREATE SEQUENCE dashboard_auditlog_id_seq;
+SELECT setval('dashboard_auditlog_id_seq', COALESCE((SELECT max(id) FROM dashboard_auditlog_unpartitioned), 0) + 1, false);
+
+CREATE TABLE dashboard_auditlog (
+    id bigint NOT NULL DEFAULT nextval('dashboard_auditlog_id_seq'),
+    {COLUMN_DEFINITIONS}
+) PARTITION BY RANGE ("timestamp");
+ALTER SEQUENCE dashboard_auditlog_id_seq OWNED BY dashboard_auditlog.id;
+CREATE TABLE dashboard_auditlog_default PARTITION OF dashboard_auditlog DEFAULT;
+
+DO $$
+DECLARE
+    month timestamptz := date_trunc('month', COALESCE(
+        (SELECT min("timestamp") FROM dashboard_auditlog_unpartitioned), now()) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    last timestamptz := date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' + interval '3 months';
+BEGIN
+    WHILE month <= last LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF dashboard_auditlog FOR VALUES FROM (%L) TO (%L)',
+            'dashboard_auditlog_p' || to_char(month AT TIME ZONE 'UTC', 'YYYY_MM'),
+            month, month + interval '1 month'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END $$;
+
+INSERT INTO dashboard_auditlog ({COLUMNS}) SELECT {COLUMNS} FROM dashboard_auditlog_unpartitioned;
+DROP TABLE dashboard_auditlog_unpartitioned;
+
+ALTER TABLE dashboard_auditlog ADD CONSTRAINT dashboard_auditlog_pkey PRIMARY KEY (id, "timestamp");
+{INDEXES}
+"""
+
+UNPARTITION = f"""
+ALTER TABLE dashboard_auditlog RENAME TO dashboard_auditlog_partitioned;
+ALTER TABLE dashboard_auditlog_partitioned ALTER COLUMN id DROP DEFAULT;
+DROP SEQUENCE dashboard_auditlog_id_seq;
+
+CREATE TABLE dashboard_auditlog (
+    id bigint NOT NULL PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+    {COLUMN_DEFINITIONS}
+);
+INSERT INTO dashboard_auditlog ({COLUMNS}) SELECT {COLUMNS} FROM dashboard_auditlog_partitioned;
+SELECT setval(pg_get_serial_sequence('dashboard_auditlog', 'id'), COALESCE((SELECT max(id) FROM dashboard_auditlog), 0) + 1, false);
+DROP TABLE dashboard_auditlog_partitioned;
+{INDEXES}
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_auditlog_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(PARTITION, UNPARTITION),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_auditlog_event_timestamp'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='dashboard_a_app_lab_26b48b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['app_label', 'model_name', 'object_id', '-timestamp', 'id'], name='dashboard_a_app_lab_d185f9_idx'),
+        ),
+    ]
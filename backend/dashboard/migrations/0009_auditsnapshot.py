@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_auditlog_object_timeline_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('app_label', models.CharField(max_length=100)),
+                ('model_name', models.CharField(max_length=100)),
+                ('object_id', models.CharField(max_length=64)),
+                ('timestamp', models.DateTimeField()),
+                ('log_id', models.BigIntegerField()),
+                ('state', models.JSONField()),
+            ],
+            options={
+                'ordering': ['-timestamp', '-log_id'],
+                'indexes': [models.Index(fields=['app_label', 'model_name', 'object_id', '-timestamp', '-log_id'], name='dashboard_a_app_lab_623ecb_idx')],
+            },
+        ),
+    ]
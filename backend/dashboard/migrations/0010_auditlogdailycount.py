@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_auditsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('action_type', models.CharField(max_length=20)),
+                ('app_label', models.CharField(max_length=100)),
+                ('model_name', models.CharField(max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['date', 'action_type', 'app_label', 'model_name'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'action_type', 'app_label', 'model_name'), name='dashboard_auditlogdailycount_uniq')],
+            },
+        ),
+    ]
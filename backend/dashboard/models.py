@@ -1,9 +1,15 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+from .search import JsonbToTsvector
 
 
 class AuditLog(models.Model):
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the event happens, not when the buffered row is written.
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
@@ -31,14 +37,21 @@ class AuditLog(models.Model):
     data_before = models.JSONField(null=True, blank=True)
     data_after = models.JSONField(null=True, blank=True)
     metadata = models.JSONField(null=True, blank=True)
+    search_vector = models.GeneratedField(
+        expression=SearchVector("user_agent", config="simple") + JsonbToTsvector("metadata"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ["-timestamp", "id"]
         indexes = [
             models.Index(fields=["timestamp"]),
             models.Index(fields=["action_type"]),
-            models.Index(fields=["app_label", "model_name"]),
+            # Object timelines; its prefix also serves app/model filters.
+            models.Index(fields=["app_label", "model_name", "object_id", "-timestamp", "id"]),
             models.Index(fields=["object_id"]),
+            GinIndex(fields=["search_vector"]),
         ]
 
 
@@ -84,6 +97,7 @@ class AlertRule(models.Model):
         indexes = [
             models.Index(fields=["metric_name", "active"]),
             models.Index(fields=["severity"]),
+            models.Index(fields=["updated_at"]),
         ]
 
 
@@ -136,6 +150,54 @@ class Incident(models.Model):
         indexes = [
             models.Index(fields=["status", "severity"]),
             models.Index(fields=["created_at"]),
+            models.Index(fields=["updated_at"]),
+        ]
+
+
+class MetricRollup(models.Model):
+    metric_name = models.CharField(max_length=100)
+    bucket_start = models.DateTimeField()
+    value = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["metric_name", "bucket_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["metric_name", "bucket_start"],
+                name="dashboard_metricrollup_bucket_uniq",
+            ),
         ]
 
-# Create your models here.
+
+class AuditSnapshot(models.Model):
+    """Full state of an audited object right after AuditLog ``log_id``; replay starts from the latest one."""
+    app_label = models.CharField(max_length=100)
+    model_name = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=64)
+    timestamp = models.DateTimeField()
+    log_id = models.BigIntegerField()
+    state = models.JSONField()
+
+    class Meta:
+        ordering = ["-timestamp", "-log_id"]
+        indexes = [
+            models.Index(fields=["app_label", "model_name", "object_id", "-timestamp", "-log_id"]),
+        ]
+
+
+class AuditLogDailyCount(models.Model):
+    date = models.DateField()
+    action_type = models.CharField(max_length=20)
+    app_label = models.CharField(max_length=100)
+    model_name = models.CharField(max_length=100)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["date", "action_type", "app_label", "model_name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "action_type", "app_label", "model_name"],
+                name="dashboard_auditlogdailycount_uniq",
+            ),
+        ]
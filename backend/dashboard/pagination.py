@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TimestampCursorPagination(CursorPagination):
+    """Keyset pages over AuditLog's default ``(-timestamp, id)`` ordering."""
+    ordering = ('-timestamp', 'id')
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class UpdatedAtCursorPagination(CursorPagination):
+    """Keyset pages over the ``(-updated_at, id)`` ordering of incidents and alert rules."""
+    ordering = ('-updated_at', 'id')
+    page_size_query_param = 'page_size'
+    max_page_size = 500
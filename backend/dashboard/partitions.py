@@ -0,0 +1,110 @@
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+
+PARENT = 'dashboard_auditlog'
+DEFAULT = f'{PARENT}_default'
+_MONTHLY = re.compile(rf'^{PARENT}_p(\d{{4}})_(\d{{2}})$')
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _start(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: date) -> str:
+    return f'{PARENT}_p{month:%Y_%m}'
+
+
+def monthly_partitions() -> List[date]:
+    """First day of the month covered by each attached monthly partition, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [PARENT],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = _MONTHLY.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def ensure_partitions(months_ahead: int = 3, at: Optional[datetime] = None) -> List[str]:
+    """Create any missing monthly partitions from the current UTC month to ``months_ahead`` months out.
+
+    Postgres refuses to create a partition while the default partition holds
+    rows in its range, so those rows are moved into the new partition with the
+    default detached, all in one transaction.
+    """
+    today = (at or now()).astimezone(timezone.utc).date()
+    current = date(today.year, today.month, 1)
+    existing = set(monthly_partitions())
+    created = []
+    qn = connection.ops.quote_name
+    for offset in range(months_ahead + 1):
+        month = _add_months(current, offset)
+        if month in existing:
+            continue
+        name = partition_name(month)
+        lower, upper = _start(month), _start(_add_months(month, 1))
+        create = (
+            f'CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(PARENT)} '
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM {qn(DEFAULT)} WHERE "timestamp" >= %s AND "timestamp" < %s)',
+                [lower, upper],
+            )
+            if not cursor.fetchone()[0]:
+                cursor.execute(create)
+            else:
+                # Generated columns such as search_vector are recomputed on insert.
+                cursor.execute(
+                    "SELECT attname FROM pg_attribute WHERE attrelid = %s::regclass "
+                    "AND attnum > 0 AND NOT attisdropped AND attgenerated = '' ORDER BY attnum",
+                    [PARENT],
+                )
+                columns = ', '.join(qn(row[0]) for row in cursor.fetchall())
+                cursor.execute(f'ALTER TABLE {qn(PARENT)} DETACH PARTITION {qn(DEFAULT)}')
+                cursor.execute(create)
+                cursor.execute(
+                    f'WITH moved AS (DELETE FROM {qn(DEFAULT)} WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING {columns}) '
+                    f'INSERT INTO {qn(name)} ({columns}) SELECT {columns} FROM moved',
+                    [lower, upper],
+                )
+                cursor.execute(f'ALTER TABLE {qn(PARENT)} ATTACH PARTITION {qn(DEFAULT)} DEFAULT')
+        created.append(name)
+    return created
+
+
+def expired_partitions(cutoff: datetime) -> List[str]:
+    """Monthly partitions whose whole range lies before ``cutoff``."""
+    return [
+        partition_name(month)
+        for month in monthly_partitions()
+        if _start(_add_months(month, 1)) <= cutoff
+    ]
+
+
+def drop_partition(name: str) -> None:
+    qn = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {qn(PARENT)} DETACH PARTITION {qn(name)}')
+        cursor.execute(f'DROP TABLE {qn(name)}')
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from rest_framework.permissions import BasePermission
 
 
@@ -8,39 +9,73 @@ ROLE_GROUPS = {
     'support': {'Support'},
 }
 
+GROUPS_VERSION_KEY = 'dashboard:roles:groups_version'
+ROLES_TTL = 3600
 
-def _user_roles(user):
+
+def _roles_key(user_id):
+    return f'dashboard:roles:{user_id}'
+
+
+def _roles_for(names):
+    return {role for role, groups in ROLE_GROUPS.items() if names & groups}
+
+
+def user_roles(user):
+    """Dashboard roles of ``user``, memoised on the instance and cached across requests.
+
+    Cached group roles are tagged with the groups version, which any group
+    rename or delete bumps; a user's own entry is dropped when their groups change.
+    """
     if not user or not user.is_authenticated:
         return set()
-    names = set(user.groups.values_list('name', flat=True))
-    roles = set()
-    for role, groups in ROLE_GROUPS.items():
-        if names & groups:
-            roles.add(role)
-    if user.is_superuser:
-        roles.add('superadmin')
+    roles = getattr(user, '_dashboard_roles', None)
+    if roles is None:
+        key = _roles_key(user.pk)
+        cached = cache.get_many([key, GROUPS_VERSION_KEY])
+        version = cached.get(GROUPS_VERSION_KEY, 0)
+        entry = cached.get(key)
+        if entry is not None and entry[0] == version:
+            roles = set(entry[1])
+        else:
+            roles = _roles_for(set(user.groups.values_list('name', flat=True)))
+            cache.set(key, (version, sorted(roles)), ROLES_TTL)
+        if user.is_superuser:
+            roles.add('superadmin')
+        user._dashboard_roles = roles
     return roles
 
 
+def invalidate_user_roles(user_ids):
+    cache.delete_many([_roles_key(user_id) for user_id in user_ids])
+
+
+def bump_groups_version():
+    try:
+        cache.incr(GROUPS_VERSION_KEY)
+    except ValueError:
+        cache.add(GROUPS_VERSION_KEY, 1, timeout=None)
+
+
 class IsSuperAdmin(BasePermission):
     def has_permission(self, request, view):
-        return 'superadmin' in _user_roles(request.user)
+        return 'superadmin' in user_roles(request.user)
 
 
 class IsOps(BasePermission):
     def has_permission(self, request, view):
-        roles = _user_roles(request.user)
+        roles = user_roles(request.user)
         return 'ops' in roles or 'superadmin' in roles
 
 
 class IsSupport(BasePermission):
     def has_permission(self, request, view):
-        roles = _user_roles(request.user)
+        roles = user_roles(request.user)
         return 'support' in roles or 'superadmin' in roles
 
 
 class IsInstructor(BasePermission):
     def has_permission(self, request, view):
-        roles = _user_roles(request.user)
+        roles = user_roles(request.user)
         return 'instructor' in roles or 'superadmin' in roles
 
@@ -0,0 +1,18 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorCombinable, SearchVectorField
+from django.db.models import F, Func
+
+
+SEARCH_CONFIG = 'simple'
+
+
+class JsonbToTsvector(SearchVectorCombinable, Func):
+    """``jsonb_to_tsvector`` over the string and numeric values of a JSON column."""
+    function = 'jsonb_to_tsvector'
+    template = "%(function)s('simple'::regconfig, COALESCE(%(expressions)s, '{}'::jsonb), '[\"string\", \"numeric\"]'::jsonb)"
+    output_field = SearchVectorField()
+
+
+def search_audit_logs(queryset, term):
+    """Match ``term`` against the indexed ``search_vector`` and annotate ``search_rank``."""
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+    return queryset.filter(search_vector=query).annotate(search_rank=SearchRank(F('search_vector'), query))
@@ -1,26 +1,50 @@
+from django.db.models import QuerySet
 from rest_framework import serializers
 from .models import AuditLog, Incident, AlertRule
+from .permissions import user_roles
+
+
+REDACTED_AUDIT_FIELDS = ('data_before', 'data_after')
+
+
+def can_view_audit_data(user):
+    return 'superadmin' in user_roles(user)
+
+
+def _audit_data_visible(context):
+    # Decided once and kept in the context shared by a list serializer and its child.
+    if 'can_view_audit_data' not in context:
+        request = context.get('request')
+        context['can_view_audit_data'] = can_view_audit_data(getattr(request, 'user', None))
+    return context['can_view_audit_data']
+
+
+class AuditLogListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # Redacted columns are never read, so skip fetching them at all.
+        if isinstance(data, QuerySet) and not _audit_data_visible(self.context):
+            data = data.defer(*REDACTED_AUDIT_FIELDS)
+        return super().to_representation(data)
 
 
 class AuditLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = AuditLog
+        list_serializer_class = AuditLogListSerializer
         fields = (
             'id', 'timestamp', 'user', 'action_type', 'app_label', 'model_name',
             'object_id', 'ip_address', 'user_agent', 'data_before', 'data_after', 'metadata'
         )
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        user = getattr(request, 'user', None)
-        is_super = bool(user and (user.is_superuser or user.groups.filter(name__in=['SuperAdmin']).exists()))
-        if not is_super:
-            if 'data_before' in data:
-                data['data_before'] = None
-            if 'data_after' in data:
-                data['data_after'] = None
-        return data
+    def get_fields(self):
+        fields = super().get_fields()
+        if not _audit_data_visible(self.context):
+            for name in REDACTED_AUDIT_FIELDS:
+                fields[name] = serializers.SerializerMethodField(method_name='get_redacted')
+        return fields
+
+    def get_redacted(self, instance):
+        return None
 
 
 class AlertRuleSerializer(serializers.ModelSerializer):
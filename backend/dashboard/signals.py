@@ -0,0 +1,165 @@
+import copy
+from typing import Any, Dict, List, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import FileField
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+
+from .audit import record
+from .permissions import bump_groups_version, invalidate_user_roles
+
+
+DEFAULT_AUDIT_MODELS = [
+    'accounts.CustomUser',
+    'batch.CourseCategory',
+    'batch.Subject',
+    'batch.Chapter',
+    'batch.Batch',
+    'live_class.LiveClass',
+    'live_class.YTClass',
+    'dashboard.AlertRule',
+    'dashboard.Incident',
+]
+
+# Changes to these are recorded, but never their values.
+REDACTED_FIELDS = {'password'}
+REDACTED = '<redacted>'
+
+_encoder = DjangoJSONEncoder()
+_tracked: Dict[type, List[Tuple[str, str, bool]]] = {}
+
+
+def audited_models():
+    for label in getattr(settings, 'DASHBOARD_AUDIT_MODELS', DEFAULT_AUDIT_MODELS):
+        try:
+            yield apps.get_model(label)
+        except LookupError:
+            continue
+
+
+def tracked_fields(model) -> List[Tuple[str, str, bool]]:
+    """``(name, attname, is_file)`` for concrete fields worth diffing; auto_now timestamps are left out."""
+    fields = _tracked.get(model)
+    if fields is None:
+        fields = [
+            (f.name, f.attname, isinstance(f, FileField))
+            for f in model._meta.concrete_fields
+            if not f.primary_key and not getattr(f, 'auto_now', False)
+        ]
+        _tracked[model] = fields
+    return fields
+
+
+def snapshot(instance) -> Dict[str, Any]:
+    # Reads __dict__ directly: deferred fields are skipped rather than loaded,
+    # and file fields contribute their stored name, never their contents.
+    values = instance.__dict__
+    state = {}
+    for name, attname, is_file in tracked_fields(type(instance)):
+        if attname not in values:
+            continue
+        value = values[attname]
+        if is_file:
+            value = getattr(value, 'name', value) or None
+        elif isinstance(value, (dict, list)):
+            value = copy.deepcopy(value)
+        state[name] = value
+    return state
+
+
+def _jsonable(name: str, value: Any) -> Any:
+    if name in REDACTED_FIELDS:
+        return REDACTED
+    if value is None or isinstance(value, (str, int, float, bool, dict, list)):
+        return value
+    try:
+        return _encoder.default(value)
+    except TypeError:
+        return str(value)
+
+
+def _as_json(state: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: _jsonable(name, value) for name, value in state.items()}
+
+
+def on_init(sender, instance, **kwargs):
+    instance._audit_state = snapshot(instance)
+
+
+def on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    meta = sender._meta
+    previous = getattr(instance, '_audit_state', {})
+    current = snapshot(instance)
+    instance._audit_state = current
+    if created:
+        state = _as_json(current)
+        record('CREATE', meta.app_label, meta.model_name, instance.pk, state=state, data_after=state)
+        return
+    # Only fields known at load time can be compared without a SELECT.
+    changed = [name for name in previous if name in current and previous[name] != current[name]]
+    if not changed:
+        return
+    record(
+        'UPDATE', meta.app_label, meta.model_name, instance.pk,
+        data_before=_as_json({name: previous[name] for name in changed}),
+        data_after=_as_json({name: current[name] for name in changed}),
+        # Instances loaded with deferred fields cannot provide a full snapshot.
+        state=_as_json(current) if len(current) == len(tracked_fields(sender)) else None,
+    )
+
+
+def on_delete(sender, instance, **kwargs):
+    meta = sender._meta
+    record('DELETE', meta.app_label, meta.model_name, instance.pk, data_before=_as_json(snapshot(instance)))
+
+
+def on_login(sender, request, user, **kwargs):
+    meta = user._meta
+    record('LOGIN', meta.app_label, meta.model_name, user.pk, user=user)
+
+
+def on_logout(sender, request, user, **kwargs):
+    if user is None:
+        return
+    meta = user._meta
+    record('LOGOUT', meta.app_label, meta.model_name, user.pk, user=user)
+
+
+def on_user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        instance.__dict__.pop('_dashboard_roles', None)
+        invalidate_user_roles([instance.pk])
+    elif action == 'pre_clear':
+        invalidate_user_roles(instance.user_set.values_list('pk', flat=True))
+    elif pk_set:
+        invalidate_user_roles(pk_set)
+
+
+def on_group_changed(sender, **kwargs):
+    bump_groups_version()
+
+
+def connect():
+    for model in audited_models():
+        label = model._meta.label_lower
+        post_init.connect(on_init, sender=model, dispatch_uid=f'dashboard_audit_init_{label}')
+        post_save.connect(on_save, sender=model, dispatch_uid=f'dashboard_audit_save_{label}')
+        post_delete.connect(on_delete, sender=model, dispatch_uid=f'dashboard_audit_delete_{label}')
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    m2m_changed.connect(on_user_groups_changed, sender=user_model.groups.through, dispatch_uid='dashboard_roles_m2m')
+    for label in ('auth.Group', 'accounts.CustomGroup'):
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            continue
+        post_save.connect(on_group_changed, sender=model, dispatch_uid=f'dashboard_roles_save_{label}')
+        post_delete.connect(on_group_changed, sender=model, dispatch_uid=f'dashboard_roles_delete_{label}')
+    user_logged_in.connect(on_login, dispatch_uid='dashboard_audit_login')
+    user_logged_out.connect(on_logout, dispatch_uid='dashboard_audit_logout')
@@ -1,21 +1,26 @@
-from datetime import timedelta
-from django.utils.timezone import now
 from celery import shared_task
-from django.apps import apps
+
+from .alerts import evaluate_alert_rules
+from .facets import rollup_audit_counts
+from .metrics import rollup_metrics
+from .partitions import ensure_partitions
 
 
 @shared_task
 def aggregate_metrics():
-    end = now()
-    start = end - timedelta(days=1)
-    User = apps.get_model('accounts', 'CustomUser')
-    active = 0
-    signups = 0
-    if User:
-        active = User.objects.filter(last_login__gte=start, last_login__lt=end).count()
-        signups = User.objects.filter(date_joined__gte=start, date_joined__lt=end).count()
-    return {
-        'active_users_24h': active,
-        'new_signups_24h': signups,
-    }
+    return rollup_metrics()
+
+
+@shared_task
+def evaluate_alerts():
+    return evaluate_alert_rules()
+
 
+@shared_task
+def maintain_audit_partitions():
+    return ensure_partitions()
+
+
+@shared_task
+def aggregate_audit_counts():
+    return rollup_audit_counts()
@@ -1,3 +1,133 @@
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils.timezone import now
+
+from . import livefeed
+from .facets import facet_counts, prune_audit_counts, rollup_audit_counts
+from .history import record_snapshots, state_at
+from .metrics import ROLLUP_TZ
+from .models import AuditLog, AuditLogDailyCount, AuditSnapshot
+
+
+def _at(day, hour):
+    return datetime.combine(day, time(hour), tzinfo=ROLLUP_TZ)
+
+
+class FacetCountTests(TestCase):
+    day = date(2026, 3, 10)
+
+    def _log(self, when, action='CREATE', app='courses', model='course'):
+        AuditLog.objects.create(timestamp=when, action_type=action, app_label=app, model_name=model)
+
+    def _seed(self):
+        d1, d2, d3 = self.day, self.day + timedelta(days=1), self.day + timedelta(days=2)
+        self._log(_at(d1, 8))
+        self._log(_at(d1, 14), 'UPDATE')
+        self._log(_at(d2, 12))
+        self._log(_at(d2, 12), app='payments', model='payment')
+        self._log(_at(d2, 23), 'DELETE', app='payments', model='payment')
+        self._log(_at(d3, 9), 'UPDATE', app='payments', model='payment')
+        self._log(_at(d3, 18))
+        rollup_audit_counts(end=_at(d3, 9))
+
+    def test_each_facet_ignores_only_its_own_filter(self):
+        self._seed()
+        result = facet_counts(AuditLog.objects.all(), end=_at(self.day + timedelta(days=3), 0),
+                              filters={'action_type': 'CREATE', 'app_label': 'payments'})
+        self.assertEqual(result['total'], 1)
+        self.assertEqual(result['facets']['action_type'], {'CREATE': 1, 'DELETE': 1, 'UPDATE': 1})
+        self.assertEqual(result['facets']['app_label'], {'courses': 3, 'payments': 1})
+        self.assertEqual(result['facets']['model_name'], {'payment': 1})
+
+    def test_partial_edge_days_are_counted_live(self):
+        self._seed()
+        self.assertEqual(sum(AuditLogDailyCount.objects.values_list('count', flat=True)), 5)
+        start, end = _at(self.day, 12), _at(self.day + timedelta(days=2), 12)
+        result = facet_counts(AuditLog.objects.all(), start, end)
+        live = facet_counts(AuditLog.objects.all(), start, end, live_only=True)
+        self.assertEqual(result, live)
+        self.assertEqual(result['total'], 5)
+        self.assertEqual(result['facets']['action_type'], {'CREATE': 2, 'UPDATE': 2, 'DELETE': 1})
+
+    def test_range_inside_one_day_is_counted_live(self):
+        self._seed()
+        result = facet_counts(AuditLog.objects.all(), _at(self.day, 7), _at(self.day, 10))
+        self.assertEqual(result['total'], 1)
+
+    def test_prune_recounts_the_cutoff_day(self):
+        self._seed()
+        rollup_audit_counts(end=_at(self.day + timedelta(days=3), 1))
+        cutoff = _at(self.day + timedelta(days=1), 18)
+        AuditLog.objects.filter(timestamp__lt=cutoff).delete()
+        prune_audit_counts(cutoff)
+        self.assertFalse(AuditLogDailyCount.objects.filter(date__lt=self.day + timedelta(days=1)).exists())
+        self.assertEqual(AuditLogDailyCount.objects.get(date=self.day + timedelta(days=1)).count, 1)
+        end = _at(self.day + timedelta(days=3), 0)
+        self.assertEqual(
+            facet_counts(AuditLog.objects.all(), end=end),
+            facet_counts(AuditLog.objects.all(), end=end, live_only=True),
+        )
+        self.assertEqual(facet_counts(AuditLog.objects.all(), end=end)['total'], 3)
+
+
+class LiveFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _publish(self, count, start=0):
+        logs = [
+            SimpleNamespace(pk=i, timestamp=now(), user_id=None, action_type='CREATE', app_label='ab'[i % 2],
+                            model_name='m', object_id=str(i), ip_address=None, user_agent=None, metadata={})
+            for i in range(start, start + count)
+        ]
+        for i in range(0, count, 10):
+            livefeed.publish(logs[i:i + 10])
+
+    def test_many_events_keep_cursors(self):
+        self._publish(250)
+        events, head = livefeed.recent(livefeed.ALL, 10)
+        self.assertEqual(head, 250)
+        self.assertEqual([e['seq'] for e in events], list(range(250, 250 - livefeed.SIZE, -1)))
+        self.assertEqual(livefeed.recent('a', 120)[0][0]['seq'], 125)
+
+    def test_cursor_ahead_of_a_restarted_ring_gets_the_whole_ring(self):
+        self._publish(20)
+        cache.clear()
+        self._publish(3)
+        events, head = livefeed.recent(livefeed.ALL, 20)
+        self.assertEqual(head, 3)
+        self.assertEqual([e['seq'] for e in events], [3, 2, 1])
+
+
+class HistoryTests(TestCase):
+    obj = {'app_label': 'courses', 'model_name': 'course', 'object_id': '7'}
+
+    def setUp(self):
+        cache.clear()
+
+    def _log(self, action, data_after=None):
+        return AuditLog.objects.create(action_type=action, data_after=data_after, **self.obj)
+
+    @mock.patch('dashboard.history.SNAPSHOT_EVERY', 3)
+    def test_updates_without_state_count_toward_the_next_snapshot(self):
+        logs = [self._log('CREATE', {'title': 'a'})] + [self._log('UPDATE', {'title': t}) for t in 'bcde']
+        states = [{'title': 'a'}, None, None, None, {'title': 'e'}]
+        self.assertEqual(record_snapshots(logs, states), 2)
+        self.assertEqual(AuditSnapshot.objects.filter(**self.obj).count(), 2)
+
+    def test_updates_without_a_base_are_reported_incomplete(self):
+        self._log('UPDATE', {'title': 'b'})
+        result = state_at(at=now(), **self.obj)
+        self.assertTrue(result['exists'])
+        self.assertFalse(result['complete'])
+        self.assertEqual(result['state'], {'title': 'b'})
 
-# Create your tests here.
+        self._log('CREATE', {'title': 'c', 'price': 1})
+        self._log('UPDATE', {'price': 2})
+        result = state_at(at=now(), **self.obj)
+        self.assertTrue(result['complete'])
+        self.assertEqual(result['state'], {'title': 'c', 'price': 2})
@@ -14,8 +14,9 @@ OVERVIEW_PAGE = {
 
 LOG_EXPLORER = {
     "filters": ["date", "user", "action_type", "app_label", "model_name", "search"],
+    "facets": {"source": "/api/dashboard/logs/facets/", "fields": ["action_type", "app_label", "model_name"]},
     "table": {"columns": ["timestamp", "user", "action_type", "app_label", "model_name", "object_id"]},
-    "export": {"modes": ["csv", "json"]},
+    "export": {"modes": ["csv", "ndjson"]},
 }
 
 INCIDENT_MANAGER = {
@@ -31,5 +32,6 @@ LIVE_FEED = {
 
 MODEL_DRILLDOWN = {
     "timeline_endpoint": "/api/dashboard/logs/timeline/",
+    "state_endpoint": "/api/dashboard/logs/state/",
 }
 
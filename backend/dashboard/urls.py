@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import MetricsView, AuditLogViewSet, IncidentViewSet, AlertRuleViewSet, LiveEventsView, AdminActionsView
+from .views import MetricsView, MetricsCacheStatsView, MetricSeriesView, AuditLogViewSet, IncidentViewSet, AlertRuleViewSet, LiveEventsView, AdminActionsView
 
 router = DefaultRouter()
 router.register(r'logs', AuditLogViewSet, basename='dashboard-logs')
@@ -10,6 +10,8 @@ router.register(r'alerts', AlertRuleViewSet, basename='dashboard-alerts')
 
 urlpatterns = [
     path('metrics/', MetricsView.as_view(), name='dashboard-metrics'),
+    path('metrics/cache-stats/', MetricsCacheStatsView.as_view(), name='dashboard-metrics-cache-stats'),
+    path('metrics/series/', MetricSeriesView.as_view(), name='dashboard-metrics-series'),
     path('live-events/', LiveEventsView.as_view(), name='dashboard-live-events'),
     path('actions/', AdminActionsView.as_view(), name='dashboard-actions'),
     path('', include(router.urls)),
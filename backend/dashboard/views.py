@@ -1,9 +1,12 @@
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 from django.apps import apps
-from django.db.models import Count, Sum
-from django.utils.timezone import now
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from django.utils.timezone import is_naive, make_aware, now
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -11,9 +14,18 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 
+from . import livefeed
+from .cache import cache_stats, get_or_compute
+from .exports import gzip_stream, stream_csv, stream_ndjson
+from .facets import facet_counts
+from .history import state_at
+from .metrics import BUCKET, ROLLUP_TZ, available_metrics, bucket_floor, period_stats, rolled_up_at, series
 from .models import AuditLog, Incident, AlertRule
-from .serializers import AuditLogSerializer, IncidentSerializer, AlertRuleSerializer
+from .pagination import TimestampCursorPagination, UpdatedAtCursorPagination
+from .serializers import AuditLogSerializer, REDACTED_AUDIT_FIELDS, can_view_audit_data, IncidentSerializer, AlertRuleSerializer
 from .permissions import IsSuperAdmin, IsOps, IsSupport
+from .search import search_audit_logs
+from .ui_definitions import OVERVIEW_PAGE
 
 
 def _parse_range(range_str: str) -> timedelta:
@@ -26,64 +38,126 @@ def _parse_range(range_str: str) -> timedelta:
     return timedelta(days=7)
 
 
+def _parse_bound(value):
+    parsed = parse_datetime(value or "")
+    if parsed is None:
+        raise ValueError(value)
+    return make_aware(parsed, ROLLUP_TZ) if is_naive(parsed) else parsed
+
+
+def _number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 2)
+
+
 class MetricsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         rng = request.query_params.get("range", "7d")
         delta = _parse_range(rng)
-        end = now()
+        data, cache_status = get_or_compute(
+            f"dashboard:metrics:v2:{int(delta.total_seconds())}",
+            lambda: self.compute(delta),
+            ttl=getattr(settings, "DASHBOARD_METRICS_CACHE_TTL", 60),
+        )
+        response = Response(data["metrics"])
+        response["X-Cache"] = cache_status.upper()
+        # Cards are only as fresh as the last rollup run; let clients see when that was.
+        response["X-Rolled-Up-At"] = data["rolled_up_at"].isoformat() if data["rolled_up_at"] else "never"
+        return response
+
+    @staticmethod
+    def compute(delta: timedelta) -> Dict[str, Any]:
+        end = bucket_floor(now()) + BUCKET
         start = end - delta
         prev_start = start - delta
-        prev_end = start
 
         data: Dict[str, Dict[str, Any]] = {}
-
-        def period_stats(qs, agg_field=None, sum_field=None):
-            if sum_field:
-                curr = qs.filter(timestamp__gte=start, timestamp__lt=end).aggregate(total=Sum(sum_field)).get("total") or 0
-                prev = qs.filter(timestamp__gte=prev_start, timestamp__lt=prev_end).aggregate(total=Sum(sum_field)).get("total") or 0
-            elif agg_field:
-                curr = qs.filter(**{f"{agg_field}__gte": start, f"{agg_field}__lt": end}).count()
-                prev = qs.filter(**{f"{agg_field}__gte": prev_start, f"{agg_field}__lt": prev_end}).count()
-            else:
-                curr = qs.filter(created_at__gte=start, created_at__lt=end).count()
-                prev = qs.filter(created_at__gte=prev_start, created_at__lt=prev_end).count()
+        for metric_name, (curr, prev) in period_stats(available_metrics(), prev_start, start, end).items():
             pct = ((curr - prev) / prev * 100.0) if prev else (100.0 if curr else 0.0)
-            return {"current": curr, "prev": prev, "pct": round(pct, 2)}
-
-        User = apps.get_model('accounts', 'CustomUser')
-        if User:
-            data["active_users"] = period_stats(User.objects.filter(is_active=True), agg_field="last_login")
-            data["new_signups"] = period_stats(User.objects.all(), agg_field="date_joined")
-
-        Payment = apps.get_model('payments', 'Payment')
-        if Payment:
-            data["revenue"] = period_stats(Payment.objects.filter(status='SUCCESS'), sum_field="amount")
-            data["failed_payments"] = period_stats(Payment.objects.filter(status='FAILED'), agg_field="timestamp")
-
-        Enrollment = apps.get_model('enrollments', 'Enrollment')
-        if Enrollment:
-            data["enrollments"] = period_stats(Enrollment.objects.all(), agg_field="created_at")
-            data["completions"] = period_stats(Enrollment.objects.filter(status='completed'), agg_field="updated_at")
-
-        LiveView = apps.get_model('live_app', 'LiveViewer')
-        if LiveView:
-            curr = LiveView.objects.filter(timestamp__gte=start, timestamp__lt=end).aggregate(total=Sum('viewer_count')).get('total') or 0
-            prev = LiveView.objects.filter(timestamp__gte=prev_start, timestamp__lt=prev_end).aggregate(total=Sum('viewer_count')).get('total') or 0
-            pct = ((curr - prev) / prev * 100.0) if prev else (100.0 if curr else 0.0)
-            data["concurrent_live_viewers"] = {"current": curr, "prev": prev, "pct": round(pct, 2)}
+            data[metric_name] = {"current": _number(curr), "prev": _number(prev), "pct": round(pct, 2)}
+        return {"metrics": data, "rolled_up_at": rolled_up_at()}
+
+
+class MetricsCacheStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsOps]
+
+    def get(self, request):
+        return Response(cache_stats())
+
+
+class MetricSeriesView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        return Response(data)
+    def get(self, request):
+        params = request.query_params
+        metric_names = available_metrics()
+        if params.get("metrics"):
+            wanted = set(params["metrics"].split(","))
+            metric_names = [m for m in metric_names if m in wanted]
+
+        latest = bucket_floor(now()) + BUCKET
+        rng = params.get("range", "7d")
+        if rng == "custom":
+            try:
+                start = _parse_bound(params.get("start"))
+                end = _parse_bound(params.get("end"))
+            except ValueError:
+                return Response({"error": "custom range needs ISO start and end"}, status=status.HTTP_400_BAD_REQUEST)
+            if start >= end:
+                return Response({"error": "start must be before end"}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            start, end = latest - _parse_range(rng), latest
+
+        # Cards sharing a spark_range (or matching the chart window) reuse one series query.
+        windows = {(start, end): series(metric_names, start, end)}
+        chart = windows[(start, end)]
+        cards = [c for c in OVERVIEW_PAGE["cards"] if c["metric_key"] in metric_names]
+        sparklines: Dict[str, Dict[str, Any]] = {}
+        for card in cards:
+            window = (latest - _parse_range(card.get("spark_range")), latest)
+            if window not in windows:
+                windows[window] = series([c["metric_key"] for c in cards], *window)
+            spark = windows[window]
+            sparklines[card["metric_key"]] = {
+                "range": card.get("spark_range"),
+                "resolution": spark["resolution"],
+                "buckets": spark["buckets"],
+                "values": [_number(v) for v in spark["series"][card["metric_key"]]],
+            }
+
+        return Response({
+            "chart": {
+                "range": rng,
+                "resolution": chart["resolution"],
+                "buckets": chart["buckets"],
+                "series": {k: [_number(v) for v in vals] for k, vals in chart["series"].items()},
+            },
+            "sparklines": sparklines,
+        })
 
 
 class AuditLogViewSet(viewsets.ModelViewSet):
     queryset = AuditLog.objects.all()
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated, IsSupport]
+    pagination_class = TimestampCursorPagination
+    ordering_fields = ['timestamp']
+
+    @cached_property
+    def can_view_data(self):
+        return can_view_audit_data(self.request.user)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['can_view_audit_data'] = self.can_view_data
+        return context
 
     def get_queryset(self):
         qs = super().get_queryset()
+        if not self.can_view_data:
+            qs = qs.defer(*REDACTED_AUDIT_FIELDS)
         params = self.request.query_params
         start = params.get('start')
         end = params.get('end')
@@ -105,11 +179,7 @@ class AuditLogViewSet(viewsets.ModelViewSet):
         if model_name:
             qs = qs.filter(model_name=model_name)
         if q:
-            qs = qs.filter(models.Q(user_agent__icontains=q) | models.Q(metadata__icontains=q))
-
-        export = params.get('export')
-        if export == 'csv':
-            return qs
+            qs = search_audit_logs(qs, q)
         return qs
 
     @action(detail=False, methods=['get'])
@@ -117,30 +187,72 @@ class AuditLogViewSet(viewsets.ModelViewSet):
         app_label = request.query_params.get('app')
         model_name = request.query_params.get('model')
         object_id = request.query_params.get('object_id')
+        if not (app_label and model_name and object_id):
+            return Response({'error': 'app, model and object_id are required'}, status=status.HTTP_400_BAD_REQUEST)
         qs = self.get_queryset().filter(app_label=app_label, model_name=model_name, object_id=object_id)
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(qs)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        params = request.query_params
+        try:
+            start = _parse_bound(params['start']) if params.get('start') else None
+            # The list filter includes `end`; facet ranges are half-open.
+            end = _parse_bound(params['end']) + timedelta(microseconds=1) if params.get('end') else None
+        except ValueError:
+            return Response({'error': 'start and end must be ISO datetimes'}, status=status.HTTP_400_BAD_REQUEST)
+        qs = AuditLog.objects.all()
+        if params.get('user'):
+            qs = qs.filter(user_id=params['user'])
+        if params.get('q'):
+            qs = search_audit_logs(qs, params['q'])
+        filters = {'action_type': params.get('action'), 'app_label': params.get('app'), 'model_name': params.get('model')}
+        live_only = bool(params.get('user') or params.get('q'))
+        return Response(facet_counts(qs, start, end, filters, live_only=live_only))
+
+    @action(detail=False, methods=['get'])
+    def state(self, request):
+        app_label = request.query_params.get('app')
+        model_name = request.query_params.get('model')
+        object_id = request.query_params.get('object_id')
+        if not (app_label and model_name and object_id):
+            return Response({'error': 'app, model and object_id are required'}, status=status.HTTP_400_BAD_REQUEST)
+        if not self.can_view_data:
+            return Response({'error': 'object state is restricted to SuperAdmin'}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            at = _parse_bound(request.query_params['at']) if request.query_params.get('at') else now()
+        except ValueError:
+            return Response({'error': 'at must be an ISO datetime'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(state_at(app_label, model_name, object_id, at))
 
     def list(self, request, *args, **kwargs):
         export = request.query_params.get('export')
-        response = super().list(request, *args, **kwargs)
         if export == 'csv':
-            rows: List[Dict[str, Any]] = response.data if isinstance(response.data, list) else response.data.get('results', [])
-            header = ['timestamp', 'user', 'action_type', 'app_label', 'model_name', 'object_id', 'ip_address']
-            lines = [','.join(header)]
-            for r in rows:
-                lines.append(','.join([
-                    str(r.get('timestamp')), str(r.get('user')), r.get('action_type') or '', r.get('app_label') or '',
-                    r.get('model_name') or '', r.get('object_id') or '', r.get('ip_address') or ''
-                ]))
-            return Response('\n'.join(lines), content_type='text/csv')
-        return response
+            qs = self.filter_queryset(self.get_queryset())
+            response = StreamingHttpResponse(stream_csv(qs), content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="audit_logs.csv"'
+            return response
+        if export == 'ndjson':
+            qs = self.filter_queryset(self.get_queryset())
+            stream = stream_ndjson(qs, include_data=self.can_view_data)
+            if request.query_params.get('compress') == 'gzip':
+                response = StreamingHttpResponse(gzip_stream(stream), content_type='application/gzip')
+                response['Content-Disposition'] = 'attachment; filename="audit_logs.ndjson.gz"'
+            else:
+                response = StreamingHttpResponse(stream, content_type='application/x-ndjson')
+                response['Content-Disposition'] = 'attachment; filename="audit_logs.ndjson"'
+            return response
+        return super().list(request, *args, **kwargs)
 
 
 class IncidentViewSet(viewsets.ModelViewSet):
     queryset = Incident.objects.all()
     serializer_class = IncidentSerializer
     permission_classes = [IsAuthenticated, IsOps]
+    pagination_class = UpdatedAtCursorPagination
+    ordering_fields = ['updated_at']
 
     @action(detail=False, methods=['post'])
     def bulk_resolve(self, request):
@@ -153,18 +265,21 @@ class AlertRuleViewSet(viewsets.ModelViewSet):
     queryset = AlertRule.objects.all()
     serializer_class = AlertRuleSerializer
     permission_classes = [IsAuthenticated, IsOps]
+    pagination_class = UpdatedAtCursorPagination
+    ordering_fields = ['updated_at']
 
 
 class LiveEventsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        app_filter = request.query_params.get('app')
-        qs = AuditLog.objects.filter(action_type__in=["UPDATE", "CREATE", "DELETE"]).order_by('-timestamp')[:100]
-        if app_filter:
-            qs = qs.filter(app_label=app_filter)
-        data = AuditLogSerializer(qs, many=True).data
-        return Response({'events': data})
+        app_filter = request.query_params.get('app') or livefeed.ALL
+        try:
+            after = int(request.query_params.get('after') or 0)
+        except ValueError:
+            return Response({'error': 'after must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        events, cursor = livefeed.recent(app_filter, after)
+        return Response({'events': events, 'cursor': cursor})
 
 
 class AdminActionsView(APIView):
@@ -175,18 +290,8 @@ class AdminActionsView(APIView):
         if action == 'force_logout':
             ids = request.data.get('user_ids', [])
             try:
-                from django.contrib.sessions.models import Session
-                from django.contrib.auth import get_user_model
-                User = get_user_model()
-                sessions = Session.objects.all()
-                count = 0
-                for session in sessions:
-                    data = session.get_decoded()
-                    uid = data.get('_auth_user_id')
-                    if uid and int(uid) in ids:
-                        session.delete()
-                        count += 1
-                return Response({'sessions_deleted': count})
+                from accounts.sessions import force_logout
+                return Response(force_logout(int(uid) for uid in ids))
             except Exception:
                 return Response({'error': 'unable to logout users'}, status=status.HTTP_400_BAD_REQUEST)
         if action == 'flag_enrollment':